@@ -5,9 +5,50 @@ from dataclasses import is_dataclass
 _marker = object()
 
 
+def _is_unresolved(typ):
+    if isinstance(typ, (str, typing.ForwardRef)):
+        return True
+    return any(_is_unresolved(arg) for arg in getattr(typ, "__args__", None) or ())
+
+
+def dataclass_fields(schema) -> typing.Dict[str, typing.Any]:
+    """
+    Get ``dataclass`` fields with resolved type annotations.
+
+    String annotations, such as from ``from __future__ import annotations``, and
+    forward references, such as ``typing.Optional['Node']``, are resolved once
+    using ``typing.get_type_hints`` and cached on the ``dataclass``. Fields with
+    unresolved annotations are returned as copies with the resolved type, other
+    fields are returned as is.
+
+    :param schema: ``dataclass`` class
+
+    :return: dictionary of field name to ``dataclass.Field``
+    """
+    # cached on the class itself, a weak cache would keep self referencing
+    # dataclass alive through field types
+    cached = schema.__dict__.get("__inverter_fields__", None)
+    if cached is not None:
+        return cached
+
+    fields = schema.__dataclass_fields__
+    if any(_is_unresolved(f.type) for f in fields.values()):
+        hints = typing.get_type_hints(schema, localns={schema.__name__: schema})
+        resolved = {}
+        for attr, prop in fields.items():
+            if _is_unresolved(prop.type):
+                prop = copy.copy(prop)
+                prop.type = hints[attr]
+            resolved[attr] = prop
+        fields = resolved
+
+    schema.__inverter_fields__ = fields
+    return fields
+
+
 def drop_empty(schema, data):
     result = {}
-    for attr, prop in sorted(schema.__dataclass_fields__.items(), key=lambda x: x[0]):
+    for attr, prop in sorted(dataclass_fields(schema).items(), key=lambda x: x[0]):
         if data.get(attr, _marker) is _marker:
             if prop.metadata.get("exclude_if_empty", None) is True:
                 continue
@@ -44,19 +85,19 @@ def dataclass_get_type(field, exclude_if_empty=False):
 
     origin = getattr(typ, "__origin__", None)
 
-    if origin == list:
+    if origin in (list, set):
         if getattr(typ, "__args__", None):
             return {
                 "name": field.name,
-                "type": list,
-                "schema": field.type.__args__[0],
+                "type": origin,
+                "schema": typ.__args__[0],
                 "required": required,
                 "metadata": metadata,
             }
         else:
             return {
                 "name": field.name,
-                "type": list,
+                "type": origin,
                 "required": required,
                 "metadata": metadata,
             }
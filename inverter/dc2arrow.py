@@ -0,0 +1,371 @@
+import dataclasses
+import json
+import typing
+from datetime import date, datetime
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        "inverter.dc2arrow requires pyarrow, install inverter[arrow]"
+    ) from e
+
+from .common import dataclass_fields, dataclass_get_type
+
+
+def _arrow_type(typ, metadata, request, ignore_required, _stack=()):
+    if typ == str:
+        return pyarrow.string()
+    if typ == bool:
+        return pyarrow.bool_()
+    if typ == int:
+        if metadata.get("format", None) == "bigint":
+            return pyarrow.int64()
+        return pyarrow.int32()
+    if typ == float:
+        return pyarrow.float64()
+    if typ == datetime:
+        return pyarrow.timestamp("ms", tz="UTC")
+    if typ == date:
+        return pyarrow.date32()
+    if dataclasses.is_dataclass(typ):
+        if typ in _stack:
+            raise TypeError(
+                "Recursive dataclass %s can't be expressed as Arrow struct" % typ
+            )
+        return pyarrow.struct(
+            _arrow_fields(
+                typ,
+                request=request,
+                ignore_required=ignore_required,
+                _stack=_stack + (typ,),
+            )
+        )
+    if typ == dict:
+        # dictionary field are encoded as JSON string, same as avro
+        return pyarrow.string()
+    raise TypeError("Unknown Arrow type for %s" % typ)
+
+
+def dataclass_field_to_arrow_field(
+    prop, schema, request, ignore_required=False, _stack=()
+) -> pyarrow.Field:
+    """
+    Converts ``dataclass.Field`` to ``pyarrow.Field``.
+
+    :param prop: ``dataclass.Field`` object
+    :param schema: ``dataclass`` class
+    :param request: request object, accepts any.
+    :param ignore_required: if ``True``, force all fields as non-required
+    :type ignore_required: bool
+    """
+    t = dataclass_get_type(prop)
+
+    if not ignore_required:
+        required = prop.metadata.get("required", False)
+    else:
+        required = False
+
+    if t["type"] == list:
+        if "schema" not in t.keys():
+            raise TypeError("Untyped list is not supported for %s" % prop.name)
+        typ = pyarrow.list_(
+            _arrow_type(
+                t["schema"],
+                {},
+                request,
+                ignore_required=ignore_required,
+                _stack=_stack,
+            )
+        )
+    else:
+        typ = _arrow_type(
+            t["type"],
+            t["metadata"],
+            request,
+            ignore_required=ignore_required,
+            _stack=_stack,
+        )
+
+    return pyarrow.field(prop.name, typ, nullable=not required)
+
+
+def dc2arrow(
+    schema,
+    *,
+    request=None,
+    include_fields: typing.List[str] = None,
+    exclude_fields: typing.List[str] = None,
+    ignore_required=True,
+) -> pyarrow.Schema:
+    """
+    Converts ``dataclass`` to ``pyarrow.Schema``
+
+    Types are mapped following the same rules as ``inverter.dc2avsc``:
+
+    - ``str`` is mapped to ``string``
+    - ``int`` is mapped to ``int32``, or ``int64`` if ``format`` is ``bigint``
+    - ``float`` is mapped to ``float64``
+    - ``date`` is mapped to ``date32``
+    - ``datetime`` is mapped to ``timestamp[ms, tz=UTC]``
+    - ``dict`` is mapped to ``string``, encoded as JSON
+    - nested ``dataclass`` is mapped to ``struct``
+    - typed ``list`` is mapped to ``list`` of its item type
+
+    :param schema: ``dataclass`` class
+    :param request: request object, accepts Any
+    :param include_fields: List of field names to include
+    :type include_fields: typing.List[str]
+    :param exclude_fields: List of field names to exclude
+    :type exclude_fields: typing.List[str]
+    :param ignore_required: if True, force all fields to be nullable
+    :type ignore_required: bool
+
+    :return: ``pyarrow.Schema``
+
+    Recursive ``dataclass`` can't be expressed as Arrow ``struct``, and raises
+    ``TypeError``.
+    """
+    return pyarrow.schema(
+        _arrow_fields(
+            schema,
+            request=request,
+            include_fields=include_fields,
+            exclude_fields=exclude_fields,
+            ignore_required=ignore_required,
+            _stack=(schema,),
+        )
+    )
+
+
+def _arrow_fields(
+    schema,
+    *,
+    request,
+    include_fields=None,
+    exclude_fields=None,
+    ignore_required=True,
+    _stack=(),
+):
+    include_fields = include_fields or []
+    exclude_fields = exclude_fields or []
+    fields = []
+    for attr, prop in dataclass_fields(schema).items():
+        if include_fields and attr not in include_fields:
+            continue
+        if attr in exclude_fields:
+            continue
+        fields.append(
+            dataclass_field_to_arrow_field(
+                prop,
+                schema=schema,
+                request=request,
+                ignore_required=ignore_required,
+                _stack=_stack,
+            )
+        )
+    return fields
+
+
+def _json_encoder(value):
+    if value is None:
+        return None
+    return json.dumps(value)
+
+
+def _value_encoder(typ):
+    """
+    Return a callable that prepares an ``appstruct`` value for ``pyarrow.array``,
+    or ``None`` if the value can be used as is.
+    """
+    if typ == dict:
+        return _json_encoder
+    if dataclasses.is_dataclass(typ):
+        encoders = _field_encoders(typ)
+        if not encoders:
+            return None
+
+        def encode(value):
+            if value is None:
+                return None
+            value = dict(value)
+            for attr, encoder in encoders.items():
+                if value.get(attr, None) is not None:
+                    value[attr] = encoder(value[attr])
+            return value
+
+        return encode
+    return None
+
+
+def _field_encoders(schema):
+    encoders = {}
+    for attr, prop in dataclass_fields(schema).items():
+        t = dataclass_get_type(prop)
+        if t["type"] == list:
+            item_encoder = _value_encoder(t.get("schema", None))
+            if item_encoder:
+                encoders[attr] = lambda v, e=item_encoder: [e(i) for i in v]
+            continue
+        encoder = _value_encoder(t["type"])
+        if encoder:
+            encoders[attr] = encoder
+    return encoders
+
+
+class RecordBatchBuilder(object):
+    """
+    Accumulates ``appstruct`` dictionaries and builds ``pyarrow.RecordBatch``
+    of at most ``batch_size`` rows.
+    """
+
+    def __init__(
+        self,
+        schema,
+        *,
+        batch_size: int = 65536,
+        request=None,
+        include_fields: typing.List[str] = None,
+        exclude_fields: typing.List[str] = None,
+        ignore_required=True,
+    ):
+        """
+        :param schema: ``dataclass`` class
+        :param batch_size: maximum number of rows per record batch
+        :param request: request object, accepts Any
+        :param include_fields: List of field names to include
+        :param exclude_fields: List of field names to exclude
+        :param ignore_required: if True, force all fields to be nullable
+        """
+        self.schema = schema
+        self.batch_size = batch_size
+        self.arrow_schema = dc2arrow(
+            schema,
+            request=request,
+            include_fields=include_fields,
+            exclude_fields=exclude_fields,
+            ignore_required=ignore_required,
+        )
+        self.names = self.arrow_schema.names
+        encoders = _field_encoders(schema)
+        self.encoders = [encoders.get(name, None) for name in self.names]
+        self._reset()
+
+    def _reset(self):
+        self.columns = [[] for name in self.names]
+        self.size = 0
+
+    def append(self, appstruct: dict) -> typing.Optional[pyarrow.RecordBatch]:
+        """
+        Append an ``appstruct`` dictionary.
+
+        :return: a ``pyarrow.RecordBatch`` when ``batch_size`` is reached, otherwise ``None``
+        """
+        for column, name in zip(self.columns, self.names):
+            column.append(appstruct.get(name, None))
+        self.size += 1
+        if self.size >= self.batch_size:
+            return self.flush()
+        return None
+
+    def extend(
+        self, appstructs: typing.Iterable[dict]
+    ) -> typing.Iterator[pyarrow.RecordBatch]:
+        """
+        Append ``appstruct`` dictionaries, yielding full record batches.
+        Remaining rows are kept until :meth:`flush` is called.
+        """
+        for appstruct in appstructs:
+            batch = self.append(appstruct)
+            if batch is not None:
+                yield batch
+
+    def flush(self) -> typing.Optional[pyarrow.RecordBatch]:
+        """
+        Build a ``pyarrow.RecordBatch`` from pending rows.
+
+        :return: ``pyarrow.RecordBatch``, or ``None`` if there is no pending row
+        """
+        if not self.size:
+            return None
+        arrays = []
+        for column, encoder, field in zip(
+            self.columns, self.encoders, self.arrow_schema
+        ):
+            if encoder:
+                column = [encoder(v) if v is not None else None for v in column]
+            arrays.append(pyarrow.array(column, type=field.type))
+        self._reset()
+        return pyarrow.RecordBatch.from_arrays(arrays, schema=self.arrow_schema)
+
+    def __call__(
+        self, appstructs: typing.Iterable[dict]
+    ) -> typing.Iterator[pyarrow.RecordBatch]:
+        """
+        Convert ``appstructs`` into record batches, including the remaining
+        partial batch.
+        """
+        yield from self.extend(appstructs)
+        batch = self.flush()
+        if batch is not None:
+            yield batch
+
+
+def write_parquet(
+    schema,
+    appstructs: typing.Iterable[dict],
+    where,
+    *,
+    batch_size: int = 65536,
+    compression: str = "snappy",
+    request=None,
+    **kwargs,
+):
+    """
+    Write ``appstructs`` to a Parquet file, one row group per record batch.
+
+    :param schema: ``dataclass`` class
+    :param appstructs: iterable of ``appstruct`` dictionaries
+    :param where: file path or writable file-like object
+    :param batch_size: maximum number of rows per record batch
+    :param compression: Parquet compression codec, defaults to 'snappy'
+    :param request: request object, accepts Any
+    :param kwargs: additional parameters for ``pyarrow.parquet.ParquetWriter``
+    """
+    builder = RecordBatchBuilder(schema, batch_size=batch_size, request=request)
+    with pyarrow.parquet.ParquetWriter(
+        where, builder.arrow_schema, compression=compression, **kwargs
+    ) as writer:
+        for batch in builder(appstructs):
+            writer.write_batch(batch)
+
+
+def write_feather(
+    schema,
+    appstructs: typing.Iterable[dict],
+    where,
+    *,
+    batch_size: int = 65536,
+    compression: str = "lz4",
+    request=None,
+):
+    """
+    Write ``appstructs`` to a Feather (Arrow IPC) file.
+
+    :param schema: ``dataclass`` class
+    :param appstructs: iterable of ``appstruct`` dictionaries
+    :param where: file path or writable file-like object
+    :param batch_size: maximum number of rows per record batch
+    :param compression: IPC buffer compression, ``'lz4'``, ``'zstd'`` or ``None``
+    :param request: request object, accepts Any
+    """
+    builder = RecordBatchBuilder(schema, batch_size=batch_size, request=request)
+    options = pyarrow.ipc.IpcWriteOptions(compression=compression)
+    with pyarrow.ipc.new_file(where, builder.arrow_schema, options=options) as writer:
+        for batch in builder(appstructs):
+            writer.write_batch(batch)
+
+
+convert = dc2arrow
@@ -1,10 +1,17 @@
 import datetime
 import typing
 
-from .common import dataclass_check_type, dataclass_get_type, is_dataclass_field
+from .common import (
+    dataclass_check_type,
+    dataclass_fields,
+    dataclass_get_type,
+    is_dataclass_field,
+)
 
 
-def dataclass_field_to_avsc_field(prop, schema, request, ignore_required=False):
+def dataclass_field_to_avsc_field(
+    prop, schema, request, ignore_required=False, namespace="inverter", named_types=None
+):
     """
     Converts ``dataclass.Field`` to Avro schema field dictionary.
 
@@ -13,6 +20,9 @@ def dataclass_field_to_avsc_field(prop, schema, request, ignore_required=False):
     :param request: request object, accepts any.
     :param ignore_required: if ``True``, force all fields as non-required
     :type ignore_required: bool
+    :param namespace: Avro schema namespace, defaults to 'inverter'
+    :param named_types: dictionary of ``dataclass`` to Avro record name that
+                        have been defined in the current schema
     """
 
     t = dataclass_get_type(prop)
@@ -76,8 +86,22 @@ def dataclass_field_to_avsc_field(prop, schema, request, ignore_required=False):
         return field
 
     if is_dataclass_field(prop):
-        subtype = dc2avsc(prop, request=request)
-        return subtype
+        if named_types is None:
+            named_types = {}
+        if t["type"] in named_types:
+            subtype = named_types[t["type"]]
+        else:
+            subtype = dc2avsc(
+                t["type"],
+                request=request,
+                namespace=namespace,
+                ignore_required=ignore_required,
+                named_types=named_types,
+            )
+        field["type"] = [subtype]
+        if not required:
+            field["type"].append("null")
+        return field
 
     if t["type"] == dict:
         # FIXME: dictionary field are expected to be
@@ -100,10 +124,14 @@ def dc2avsc(
     exclude_fields: typing.List[str] = None,
     namespace="inverter",
     ignore_required=True,
+    named_types=None,
 ):
     """
     Converts ``dataclass`` to Avro Schema JSON dictionary
 
+    Nested ``dataclass`` is defined as a named record on its first use,
+    and referenced by name on subsequent uses, including recursive use.
+
     :param schema: ``dataclass`` class
     :param request: request object, accepts Any
     :param include_fields: List of field names to include
@@ -113,18 +141,28 @@ def dc2avsc(
     :param namespace: Avro schema namespace, defaults to 'inverter'
     :param ignore_required: if True, force all fields to be non-required
     :type ignore_required: bool
+    :param named_types: dictionary of ``dataclass`` to Avro record name that
+                        have been defined in the current schema
 
     :return: dictionary representing Avro Schema.
     """
+    if named_types is None:
+        named_types = {}
+    named_types[schema] = "%s.%s" % (namespace, schema.__name__)
     result = {
         "namespace": namespace,
         "type": "record",
         "name": str(schema.__name__),
         "fields": [],
     }
-    for attr, prop in schema.__dataclass_fields__.items():
+    for attr, prop in dataclass_fields(schema).items():
         field = dataclass_field_to_avsc_field(
-            prop, schema=schema, request=request, ignore_required=ignore_required
+            prop,
+            schema=schema,
+            request=request,
+            ignore_required=ignore_required,
+            namespace=namespace,
+            named_types=named_types,
         )
         result["fields"].append(field)
 
@@ -1,5 +1,6 @@
 import copy
 import dataclasses
+import json
 import typing
 from dataclasses import _MISSING_TYPE, field
 from datetime import date, datetime
@@ -12,7 +13,12 @@ from deform.schema import default_widget_makers
 from deform.widget import HiddenWidget, TextAreaWidget, TextInputWidget
 from pkg_resources import resource_filename
 
-from .common import dataclass_check_type, dataclass_get_type, is_dataclass_field
+from .common import (
+    dataclass_check_type,
+    dataclass_fields,
+    dataclass_get_type,
+    is_dataclass_field,
+)
 
 
 def replace_colander_null(appstruct, value=None):
@@ -156,6 +162,228 @@ class SchemaNode(colander.SchemaNode):
         return cstruct
 
 
+class _EmptyNestedNode(object):
+    """
+    Mixin of built ``LazySchemaNode``. ``None`` value of optional nested
+    ``dataclass`` serializes to ``colander.null``.
+    """
+
+    def serialize(self, appstruct=colander.null):
+        if appstruct is colander.null or appstruct is None:
+            return colander.null
+        return super().serialize(appstruct)
+
+
+def _materialized_class(cls):
+    if "_materialized_class" not in cls.__dict__:
+        cls._materialized_class = type(cls.__name__, (_EmptyNestedNode, cls), {})
+    return cls._materialized_class
+
+
+class RecursiveMapping(colander.SchemaType):
+    """
+    Type of ``RecursiveSchemaNode``. Serialization and deserialization are
+    delegated to a schema node built by ``factory`` on each call.
+
+    :meta private:
+    """
+
+    def __init__(self, factory: typing.Callable[[], colander.SchemaNode]):
+        self.factory = factory
+
+    def _node(self, node):
+        built = self.factory()
+        if node.bindings is not None:
+            built = built.bind(**node.bindings)
+        built.name = node.name
+        return built
+
+    def serialize(self, node, appstruct):
+        if appstruct is colander.null or appstruct is None:
+            return colander.null
+        return self._node(node).serialize(appstruct)
+
+    def deserialize(self, node, cstruct):
+        if cstruct is colander.null or cstruct is None:
+            return colander.null
+        return self._node(node).deserialize(cstruct)
+
+
+class RecursiveWidget(HiddenWidget):
+    """
+    Widget of ``RecursiveSchemaNode``, which have no child fields to render.
+    The value is kept in the form as hidden JSON.
+
+    :meta private:
+    """
+
+    def serialize(self, field, cstruct, **kw):
+        if cstruct not in (colander.null, None):
+            cstruct = json.dumps(cstruct, default=lambda o: None)
+        return super().serialize(field, cstruct, **kw)
+
+    def deserialize(self, field, pstruct):
+        pstruct = super().deserialize(field, pstruct)
+        if pstruct is colander.null:
+            return pstruct
+        try:
+            return _none_to_null(json.loads(pstruct))
+        except ValueError:
+            raise colander.Invalid(field.schema, "Invalid JSON", pstruct)
+
+
+def _none_to_null(cstruct):
+    if cstruct is None:
+        return colander.null
+    if isinstance(cstruct, dict):
+        return {k: _none_to_null(v) for k, v in cstruct.items()}
+    if isinstance(cstruct, list):
+        return [_none_to_null(v) for v in cstruct]
+    return cstruct
+
+
+class RecursiveSchemaNode(SchemaNode):
+    """
+    Schema node of a nested ``dataclass`` that is already being built by one
+    of its parent nodes. It has no child nodes, so that schema trees of
+    recursive ``dataclass`` are finite.
+
+    :meta private:
+    """
+
+
+class LazySchemaNode(SchemaNode):
+    """
+    Placeholder for a nested ``dataclass`` schema node. The actual schema
+    node is built by calling ``factory`` on first attribute access, and the
+    placeholder then turns into the built node in place.
+
+    Nested ``dataclass`` placeholders of the built node are replaced with new
+    placeholders, and placeholders of ``dataclass`` that are already being
+    built by a parent node with ``RecursiveSchemaNode``, so that no node is
+    shared across levels of a recursive ``dataclass``.
+
+    :meta private:
+    """
+
+    insert_before = None
+
+    def __new__(cls, *args, **kw):
+        node = object.__new__(cls)
+        node._order = next(cls._counter)
+        return node
+
+    def __init__(
+        self,
+        factory: typing.Callable[[], colander.SchemaNode],
+        key: typing.Optional[typing.Hashable] = None,
+        **kw,
+    ):
+        self.__dict__["_factory"] = factory
+        self.__dict__["_lazy_key"] = key
+        self.__dict__["_lazy_parents"] = frozenset()
+        self.__dict__.update(kw)
+
+    def __getattr__(self, name):
+        if name.startswith("__") or "_factory" not in self.__dict__:
+            raise AttributeError(name)
+        self._materialize()
+        return getattr(self, name)
+
+    def _materialize(self):
+        placeholder = dict(self.__dict__)
+        parents = self._lazy_parents
+        if self._lazy_key is not None:
+            parents = parents | {self._lazy_key}
+        self.__dict__["_placeholder"] = placeholder
+        node = self.__dict__.pop("_factory")()
+        node.children = [_detach_lazy(child, parents) for child in node.children]
+        attrs = dict(node.__dict__)
+        attrs.update(self.__dict__)
+        self.__dict__.update(attrs)
+        self.__class__ = _materialized_class(node.__class__)
+        if self.bindings is not None:
+            self._bind(self.bindings)
+
+    def clone(self):
+        if "_factory" not in self.__dict__:
+            return super().clone()
+        cloned = object.__new__(LazySchemaNode)
+        cloned.__dict__.update(self.__dict__)
+        return cloned
+
+    def _bind(self, kw):
+        if "_factory" not in self.__dict__:
+            return super()._bind(kw)
+        self.__dict__["bindings"] = kw
+
+    def serialize(self, appstruct=colander.null):
+        if appstruct is colander.null or appstruct is None:
+            return colander.null
+        self._materialize()
+        return self.serialize(appstruct)
+
+    def deserialize(self, cstruct=colander.null):
+        self._materialize()
+        return self.deserialize(cstruct)
+
+
+def _detach_lazy(node: colander.SchemaNode, parents: frozenset) -> colander.SchemaNode:
+    placeholder = node.__dict__.get("_placeholder", node.__dict__)
+    if "_factory" in placeholder:
+        if placeholder["_lazy_key"] in parents:
+            attrs = {
+                k: v
+                for k, v in placeholder.items()
+                if k not in ("_factory", "_lazy_key", "_lazy_parents")
+            }
+            return RecursiveSchemaNode(
+                RecursiveMapping(placeholder["_factory"]),
+                widget=RecursiveWidget(),
+                **attrs,
+            )
+        detached = object.__new__(LazySchemaNode)
+        detached.__dict__.update(placeholder)
+        detached.__dict__["_lazy_parents"] = parents
+        return detached
+    children = [_detach_lazy(child, parents) for child in node.children]
+    if all(a is b for a, b in zip(children, node.children)):
+        return node
+    detached = _shallow_clone(node)
+    detached.children = children
+    return detached
+
+
+def lazy_subschema_node(
+    build: typing.Callable[[], typing.Type[colander.SchemaNode]],
+    subschema_cache: typing.Optional[dict] = None,
+    key: typing.Optional[typing.Hashable] = None,
+    **kw,
+) -> LazySchemaNode:
+    """
+    Create a ``LazySchemaNode`` for a nested ``dataclass``. The schema class
+    returned by ``build`` is interned in ``subschema_cache`` under ``key``,
+    so that every use of the same nested ``dataclass`` share the same schema
+    class, and recursive ``dataclass`` resolve to it instead of recursing.
+
+    :param build: callable that returns ``colander.Schema`` class
+    :param subschema_cache: dictionary to intern schema classes in
+    :param key: interning key, if ``None`` the schema class is not interned
+    :param kw: attributes to set on the schema node
+
+    :meta private:
+    """
+
+    def factory():
+        if subschema_cache is None or key is None:
+            return build()()
+        if key not in subschema_cache:
+            subschema_cache[key] = build()
+        return subschema_cache[key]()
+
+    return LazySchemaNode(factory, key, **kw)
+
+
 def colander_params(
     prop: dataclasses.Field,
     oid_prefix: str,
@@ -276,8 +504,8 @@ def dataclass_field_to_colander_schemanode(
     mode=None,
     default_tzinfo=pytz.UTC,
     metadata=None,
+    subschema_cache=None,
 ) -> colander.SchemaNode:
-
     """
     Converts ``dataclass.Field`` to ``colander.SchemaNode``
 
@@ -288,6 +516,7 @@ def dataclass_field_to_colander_schemanode(
     :param mode: One of the following: ``'default'``, ``'edit'``, ``'edit-process'``
     :param default_tzinfo: Default timezone to use for ``datetime`` handling, defaults to ``pytz.UTC``
     :param metadata: additional metadata override
+    :param subschema_cache: dictionary to intern nested ``dataclass`` schema in
 
     :return: converted ``colander.SchemaNode``
     """
@@ -359,19 +588,28 @@ def dataclass_field_to_colander_schemanode(
         return SchemaNode(**params)
     if t["type"] == bool:
         params = colander_params(
-            prop, oid_prefix, typ=Boolean(), schema=schema, request=request, mode=mode,
+            prop,
+            oid_prefix,
+            typ=Boolean(),
+            schema=schema,
+            request=request,
+            mode=mode,
         )
         return SchemaNode(**params)
 
     if is_dataclass_field(prop):
-        subtype = dc2colander(
-            t["type"],
-            request=request,
-            colander_schema_type=colander.MappingSchema,
-            mode=mode,
+        return lazy_subschema_node(
+            lambda: dc2colander(
+                t["type"],
+                request=request,
+                colander_schema_type=colander.MappingSchema,
+                mode=mode,
+                subschema_cache=subschema_cache,
+            ),
+            subschema_cache,
+            ("dc2colander", t["type"], mode),
+            missing=colander.required if t["required"] else None,
         )
-
-        return subtype()
     if t["type"] == dict:
         params = colander_params(
             prop,
@@ -430,6 +668,7 @@ def dc2colander(
     default_tzinfo=pytz.UTC,
     field_metadata=None,
     dataclass_field_to_colander_schemanode=dataclass_field_to_colander_schemanode,
+    subschema_cache=None,
 ) -> typing.Type[colander.MappingSchema]:
     """
     Converts ``dataclass`` to ``colander.Schema``
@@ -455,6 +694,11 @@ def dc2colander(
     :param default_tzinfo: default timezone for ``datetime`` handling, defaults to ``pytz.UTC``
     :param field_metadata: a dictionary for overriding field metadata. Structure: ``{'<fieldname>': {'metadatakey': 'metadataval'}}``
     :param dataclass_field_to_colander_schemanode: ``colander.SchemaNode`` factory function.
+    :param subschema_cache: dictionary to intern nested ``dataclass`` schema in. Every use
+                            of the same nested ``dataclass`` within a conversion share the same
+                            schema class, and recursive ``dataclass`` are resolved lazily. A long
+                            lived dictionary may be passed to share it across conversions, as
+                            long as ``request`` does not affect the schema.
 
     :return: ``colander.Schema`` class
 
@@ -483,10 +727,12 @@ def dc2colander(
     hidden_fields = hidden_fields or []
     readonly_fields = readonly_fields or []
     field_metadata = field_metadata or {}
+    if subschema_cache is None:
+        subschema_cache = {}
     if mode == "edit":
         readonly_fields += [
             attr
-            for attr, prop in schema.__dataclass_fields__.items()
+            for attr, prop in dataclass_fields(schema).items()
             if (
                 not prop.metadata.get("editable", True)
                 or prop.metadata.get("readonly", False)
@@ -495,7 +741,7 @@ def dc2colander(
     elif mode == "edit-process":
         exclude_fields += [
             attr
-            for attr, prop in schema.__dataclass_fields__.items()
+            for attr, prop in dataclass_fields(schema).items()
             if (
                 not prop.metadata.get("editable", True)
                 or prop.metadata.get("readonly", False)
@@ -504,12 +750,12 @@ def dc2colander(
     else:
         readonly_fields += [
             attr
-            for attr, prop in schema.__dataclass_fields__.items()
+            for attr, prop in dataclass_fields(schema).items()
             if (prop.metadata.get("readonly", False))
         ]
 
     if include_fields:
-        for attr, prop in schema.__dataclass_fields__.items():
+        for attr, prop in dataclass_fields(schema).items():
             if prop.name in include_fields and prop.name not in exclude_fields:
                 prop = dataclass_field_to_colander_schemanode(
                     prop,
@@ -519,10 +765,11 @@ def dc2colander(
                     mode=mode,
                     metadata=field_metadata.get(prop.name, {}),
                     default_tzinfo=default_tzinfo,
+                    subschema_cache=subschema_cache,
                 )
                 attrs[attr] = prop
     else:
-        for attr, prop in schema.__dataclass_fields__.items():
+        for attr, prop in dataclass_fields(schema).items():
             if prop.name not in exclude_fields:
                 prop = dataclass_field_to_colander_schemanode(
                     prop,
@@ -532,11 +779,12 @@ def dc2colander(
                     mode=mode,
                     metadata=field_metadata.get(prop.name, {}),
                     default_tzinfo=default_tzinfo,
+                    subschema_cache=subschema_cache,
                 )
                 attrs[attr] = prop
 
     for attr, prop in attrs.items():
-        dcprop = schema.__dataclass_fields__[attr]
+        dcprop = dataclass_fields(schema)[attr]
 
         t = dataclass_get_type(dcprop)
         if attr in hidden_fields:
@@ -606,4 +854,119 @@ def dc2colander(
     return Schema
 
 
+def _shallow_clone(node: colander.SchemaNode) -> colander.SchemaNode:
+    cloned = object.__new__(node.__class__)
+    cloned.__dict__.update(node.__dict__)
+    cloned.children = list(node.children)
+    return cloned
+
+
+class SchemaTemplate(object):
+    """
+    Prebuilt ``colander`` schema instance that can be cheaply instantiated
+    and bound.
+
+    ``colander.SchemaNode.bind`` clones the whole schema tree on every call.
+    This template scans the schema once, and on :meth:`bind` only clones
+    nodes that are changed by binding (nodes with ``colander.deferred``
+    attributes, ``after_bind`` hooks or schema level validators created by
+    :func:`dc2colander`) and their parents. All other nodes are shared with
+    the template, and must be treated as read-only.
+
+    .. code-block:: python
+
+       template = SchemaTemplate(dc2colander(MyDataclass))
+       schema = template.bind(request=request)
+    """
+
+    def __init__(self, schema, **kw):
+        """
+        :param schema: ``colander.SchemaNode`` class or instance
+        :param kw: constructor parameters if ``schema`` is a class
+        """
+        if isinstance(schema, type):
+            schema = schema(**kw)
+        self.template = schema
+        self._deferred = {}
+        self._rebind = set()
+        self._scanned = set()
+        self._scanning = set()
+        self._scan(schema)
+
+    def _scan(self, node):
+        if id(node) in self._scanning:
+            # recursive schema, treat as changed by binding
+            return True
+        if id(node) in self._scanned:
+            return id(node) in self._rebind
+        self._scanning.add(id(node))
+        children = node.children
+        deferred = [
+            k for k in dir(node) if isinstance(getattr(node, k), colander.deferred)
+        ]
+        rebind = bool(deferred) or (
+            node.after_bind is not None
+            or getattr(type(node), "validator", None) is not None
+            or isinstance(node, RecursiveSchemaNode)
+        )
+        for child in children:
+            if self._scan(child):
+                rebind = True
+        if deferred:
+            self._deferred[id(node)] = deferred
+        if rebind:
+            self._rebind.add(id(node))
+        self._scanning.remove(id(node))
+        self._scanned.add(id(node))
+        return rebind
+
+    def instantiate(self) -> colander.SchemaNode:
+        """
+        Create a new unbound schema instance. Child nodes are shared with the
+        template, clone a child node before modifying it.
+
+        :return: ``colander.SchemaNode`` instance
+        """
+        return _shallow_clone(self.template)
+
+    def bind(self, **kw) -> colander.SchemaNode:
+        """
+        Create a new schema instance bound with ``kw``, equivalent to
+        ``colander.SchemaNode.bind``.
+
+        :return: bound ``colander.SchemaNode`` instance
+        """
+        cloned = self._bind(self.template, kw, {})
+        if cloned is self.template:
+            cloned = _shallow_clone(self.template)
+            cloned.bindings = kw
+        return cloned
+
+    def _bind(self, node, kw, memo):
+        if id(node) not in self._rebind:
+            return node
+        if id(node) in memo:
+            return memo[id(node)]
+        cloned = _shallow_clone(node)
+        memo[id(node)] = cloned
+        cloned.children = [self._bind(child, kw, memo) for child in node.children]
+        cloned.bindings = kw
+        for k in self._deferred.get(id(node), []):
+            v = getattr(cloned, k)(cloned, kw)
+            if isinstance(v, colander.SchemaNode):
+                if not v.name:
+                    v.name = k
+                if v.raw_title is colander._marker:
+                    v.title = k.replace("_", " ").title()
+                if cloned.get(v.name, None) is not None:
+                    cloned[v.name] = v
+                else:
+                    cloned.add(v)
+            else:
+                setattr(cloned, k, v)
+        if getattr(cloned, "after_bind", None):
+            cloned.after_bind(cloned, kw)
+        return cloned
+
+
 convert = dc2colander
@@ -9,7 +9,7 @@ import pytz
 from .common import dataclass_check_type, dataclass_get_type, is_dataclass_field
 from .dc2colander import SchemaNode, colander_params
 from .dc2colander import dataclass_field_to_colander_schemanode as orig_dc2colander_node
-from .dc2colander import dc2colander
+from .dc2colander import dc2colander, lazy_subschema_node
 from .dc2colanderjson import Boolean, Float, Int, Str
 
 
@@ -48,6 +48,7 @@ def dataclass_field_to_colander_schemanode(
     mode=None,
     default_tzinfo=pytz.UTC,
     metadata=None,
+    subschema_cache=None,
 ) -> colander.SchemaNode:
 
     t = dataclass_get_type(prop)
@@ -100,15 +101,21 @@ def dataclass_field_to_colander_schemanode(
         return SchemaNode(**params)
 
     if is_dataclass_field(prop):
-        subtype = dc2colanderESjson(
-            prop,
-            colander_schema_type=colander.MappingSchema,
-            request=request,
-            mode=mode,
-            field_metadata=metadata,
-            default_tzinfo=default_tzinfo,
+        key = ("dc2colanderESjson", t["type"], mode, default_tzinfo)
+        return lazy_subschema_node(
+            lambda: dc2colanderESjson(
+                t["type"],
+                colander_schema_type=colander.MappingSchema,
+                request=request,
+                mode=mode,
+                field_metadata=metadata,
+                default_tzinfo=default_tzinfo,
+                subschema_cache=subschema_cache,
+            ),
+            subschema_cache,
+            None if metadata else key,
+            missing=colander.required if t["required"] else None,
         )
-        return subtype()
 
     if t["type"] == dict:
         params = colander_params(
@@ -129,6 +136,7 @@ def dataclass_field_to_colander_schemanode(
         mode=mode,
         default_tzinfo=default_tzinfo,
         metadata=metadata,
+        subschema_cache=subschema_cache,
     )
 
 
@@ -146,6 +154,7 @@ def dc2colanderESjson(
     default_tzinfo=pytz.UTC,
     mode="default",
     field_metadata=None,
+    subschema_cache=None,
 ) -> typing.Type[colander.MappingSchema]:
     """
     Converts ``dataclass`` to ``colander.Schema`` that serializes to ElasticSearch
@@ -170,6 +179,7 @@ def dc2colanderESjson(
         mode=mode,
         default_tzinfo=default_tzinfo,
         field_metadata=field_metadata,
+        subschema_cache=subschema_cache,
     )
 
 
@@ -9,7 +9,7 @@ import pytz
 from .common import dataclass_check_type, dataclass_get_type, is_dataclass_field
 from .dc2colander import SchemaNode, colander_params
 from .dc2colander import dataclass_field_to_colander_schemanode as orig_dc2colander_node
-from .dc2colander import dc2colander
+from .dc2colander import dc2colander, lazy_subschema_node
 from .dc2colanderjson import Boolean, Date, DateTime, Float, Int, Str
 
 
@@ -33,6 +33,7 @@ def dataclass_field_to_colander_schemanode(
     mode=None,
     default_tzinfo=pytz.UTC,
     metadata=None,
+    subschema_cache=None,
 ) -> colander.SchemaNode:
 
     t = dataclass_get_type(prop)
@@ -87,15 +88,21 @@ def dataclass_field_to_colander_schemanode(
         return SchemaNode(**params)
 
     if is_dataclass_field(prop):
-        subtype = dc2colanderavro(
-            prop,
-            colander_schema_type=colander.MappingSchema,
-            request=request,
-            mode=mode,
-            default_tzinfo=default_tzinfo,
-            field_metadata=metadata,
+        key = ("dc2colanderavro", t["type"], mode, default_tzinfo)
+        return lazy_subschema_node(
+            lambda: dc2colanderavro(
+                t["type"],
+                colander_schema_type=colander.MappingSchema,
+                request=request,
+                mode=mode,
+                default_tzinfo=default_tzinfo,
+                field_metadata=metadata,
+                subschema_cache=subschema_cache,
+            ),
+            subschema_cache,
+            None if metadata else key,
+            missing=colander.required if t["required"] else None,
         )
-        return subtype()
 
     if t["type"] == dict:
         params = colander_params(
@@ -116,6 +123,7 @@ def dataclass_field_to_colander_schemanode(
         mode=mode,
         default_tzinfo=default_tzinfo,
         metadata=metadata,
+        subschema_cache=subschema_cache,
     )
 
 
@@ -133,6 +141,7 @@ def dc2colanderavro(
     mode="default",
     default_tzinfo=None,
     field_metadata=None,
+    subschema_cache=None,
 ) -> typing.Type[colander.MappingSchema]:
     """
     Converts ``dataclass`` to ``colander.Schema`` that serializes to Avro compatible
@@ -158,6 +167,7 @@ def dc2colanderavro(
         mode=mode,
         default_tzinfo=default_tzinfo,
         field_metadata=field_metadata,
+        subschema_cache=subschema_cache,
     )
 
 
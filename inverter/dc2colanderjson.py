@@ -8,7 +8,7 @@ import pytz
 from .common import dataclass_check_type, dataclass_get_type, is_dataclass_field
 from .dc2colander import Mapping, SchemaNode, colander_params
 from .dc2colander import dataclass_field_to_colander_schemanode as orig_dc2colander_node
-from .dc2colander import dc2colander
+from .dc2colander import dc2colander, lazy_subschema_node
 
 epoch_date = date(1970, 1, 1)
 
@@ -146,6 +146,7 @@ def dataclass_field_to_colander_schemanode(
     mode=None,
     metadata=None,
     default_tzinfo=pytz.UTC,
+    subschema_cache=None,
 ) -> colander.SchemaNode:
 
     t = dataclass_get_type(prop)
@@ -215,15 +216,21 @@ def dataclass_field_to_colander_schemanode(
         return SchemaNode(**params)
 
     if is_dataclass_field(prop):
-        subtype = dc2colanderjson(
-            t["type"],
-            colander_schema_type=colander.MappingSchema,
-            request=request,
-            mode=mode,
-            default_tzinfo=default_tzinfo,
-            field_metadata=metadata,
+        key = ("dc2colanderjson", t["type"], mode, default_tzinfo)
+        return lazy_subschema_node(
+            lambda: dc2colanderjson(
+                t["type"],
+                colander_schema_type=colander.MappingSchema,
+                request=request,
+                mode=mode,
+                default_tzinfo=default_tzinfo,
+                field_metadata=metadata,
+                subschema_cache=subschema_cache,
+            ),
+            subschema_cache,
+            None if metadata else key,
+            missing=colander.required if t["required"] else None,
         )
-        return subtype()
 
     if t["type"] == dict:
         params = colander_params(
@@ -244,6 +251,7 @@ def dataclass_field_to_colander_schemanode(
         mode=mode,
         default_tzinfo=default_tzinfo,
         metadata=metadata,
+        subschema_cache=subschema_cache,
     )
 
 
@@ -261,6 +269,7 @@ def dc2colanderjson(
     mode="default",
     default_tzinfo=pytz.UTC,
     field_metadata=None,
+    subschema_cache=None,
 ) -> typing.Type[colander.MappingSchema]:
 
     """
@@ -285,6 +294,7 @@ def dc2colanderjson(
         mode=mode,
         field_metadata=field_metadata,
         default_tzinfo=default_tzinfo,
+        subschema_cache=subschema_cache,
     )
 
 
@@ -0,0 +1,184 @@
+import dataclasses
+import json
+import typing
+from datetime import date, datetime
+
+import pytz
+
+from .common import dataclass_fields, dataclass_get_type
+
+ACTIONS = ("index", "create", "update", "delete")
+
+_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _encode_date(value):
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.isoformat()
+
+
+def _encode_datetime(value):
+    return value.astimezone(pytz.UTC).isoformat()
+
+
+def _identity(value):
+    return value
+
+
+def _value_encoder(typ, encoders):
+    if typ == date:
+        return _encode_date
+    if typ == datetime:
+        return _encode_datetime
+    if dataclasses.is_dataclass(typ):
+        return record_encoder(typ, _encoders=encoders)
+    return None
+
+
+def record_encoder(
+    schema, *, _encoders=None
+) -> typing.Callable[[typing.Any], typing.Dict[str, typing.Any]]:
+    """
+    Get function that converts ``appstruct`` dictionary or ``dataclass``
+    instance into ElasticSearch document dictionary, following the same rules
+    as ``inverter.dc2colanderESjson``:
+
+    - date is serialized as YYYY-MM-DD string
+    - datetime is serialized as iso8601 string in UTC
+    - nested ``dataclass`` is serialized recursively
+    - fields which are not part of the ``dataclass`` are dropped
+
+    :param schema: ``dataclass`` class
+
+    :return: callable that accepts a record and returns ``dict``
+    """
+    if _encoders is None:
+        _encoders = {}
+    if schema in _encoders:
+        return _encoders[schema]
+
+    fields = []
+
+    def encode(record):
+        if isinstance(record, dict):
+            get = record.get
+        else:
+            get = lambda attr, default=None: getattr(record, attr, default)
+        result = {}
+        for attr, encoder, item_encoder in fields:
+            value = get(attr, None)
+            if value is not None:
+                if encoder:
+                    value = encoder(value)
+                elif item_encoder:
+                    value = [None if v is None else item_encoder(v) for v in value]
+            result[attr] = value
+        return result
+
+    # registered before building the fields, so that recursive dataclass
+    # resolves to this encoder
+    _encoders[schema] = encode
+    for attr, prop in dataclass_fields(schema).items():
+        t = dataclass_get_type(prop)
+        if t["type"] in (list, set):
+            item_encoder = _value_encoder(t.get("schema", None), _encoders)
+            if item_encoder is None and t["type"] == set:
+                # set is not JSON serializable, convert it to list
+                item_encoder = _identity
+            fields.append((attr, None, item_encoder))
+        else:
+            fields.append((attr, _value_encoder(t["type"], _encoders), None))
+    return encode
+
+
+def _meta_field(schema, key):
+    for attr, prop in dataclass_fields(schema).items():
+        if prop.metadata.get(key, None):
+            return attr
+    return None
+
+
+def dc2esbulk(
+    schema,
+    records: typing.Iterable[typing.Any],
+    *,
+    index: typing.Optional[str] = None,
+    action: str = "index",
+    max_docs: int = 1000,
+    max_bytes: int = 5 * 1024 * 1024,
+    doc_as_upsert: bool = False,
+) -> typing.Iterator[bytes]:
+    """
+    Convert records into ElasticSearch ``_bulk`` API request bodies.
+
+    Each record is serialized once into NDJSON bytes, and bodies are split so
+    that each body contains at most ``max_docs`` actions and ``max_bytes``
+    bytes. A single action larger than ``max_bytes`` is sent in its own body.
+
+    :param schema: ``dataclass`` class
+    :param records: iterable of ``appstruct`` dictionaries or ``dataclass``
+                    instances
+    :param index: target index name, omitted from the action if ``None``
+    :param action: bulk action, one of ``index``, ``create``, ``update``,
+                   ``delete``
+    :param max_docs: maximum number of actions per body
+    :param max_bytes: maximum size of a body in bytes
+    :param doc_as_upsert: set ``doc_as_upsert`` on ``update`` actions
+
+    :return: iterator of ``bytes`` request bodies
+
+    **Metadata handling**
+
+    - ``es.id: bool`` - use the field value as document ``_id``
+    - ``es.routing: bool`` - use the field value as document ``routing``
+
+    .. code-block:: python
+
+       for body in dc2esbulk(MyData, records, index='mydata'):
+           es.bulk(body=body)
+    """
+    if action not in ACTIONS:
+        raise ValueError("Unknown bulk action %s" % action)
+    id_field = _meta_field(schema, "es.id")
+    routing_field = _meta_field(schema, "es.routing")
+    if action in ("update", "delete") and id_field is None:
+        raise ValueError("%s action requires es.id field metadata" % action)
+
+    encode = record_encoder(schema)
+    dumps = _json_encoder.encode
+    header = {}
+    if index is not None:
+        header["_index"] = index
+
+    lines = []
+    size = 0
+    for record in records:
+        doc = encode(record)
+        meta = dict(header)
+        if id_field is not None:
+            meta["_id"] = doc[id_field]
+        if routing_field is not None and doc[routing_field] is not None:
+            meta["routing"] = doc[routing_field]
+        line = dumps({action: meta}) + "\n"
+        if action == "update":
+            body = {"doc": doc}
+            if doc_as_upsert:
+                body["doc_as_upsert"] = True
+            line += dumps(body) + "\n"
+        elif action != "delete":
+            line += dumps(doc) + "\n"
+        line = line.encode("utf-8")
+
+        if lines and (len(lines) >= max_docs or size + len(line) > max_bytes):
+            yield b"".join(lines)
+            lines = []
+            size = 0
+        lines.append(line)
+        size += len(line)
+
+    if lines:
+        yield b"".join(lines)
+
+
+convert = dc2esbulk
@@ -3,63 +3,214 @@ import dataclasses
 import typing
 from datetime import date, datetime
 
-from .common import dataclass_check_type, dataclass_get_type, is_dataclass_field
+from .common import (
+    dataclass_check_type,
+    dataclass_fields,
+    dataclass_get_type,
+    is_dataclass_field,
+)
+
+#: named mapping profiles. Each profile provides:
+#:
+#: - ``settings`` - index settings
+#: - ``dynamic`` - root ``dynamic`` mapping parameter. With ``strict``,
+#:   ``dict`` and untyped ``list`` fields are mapped with ``dynamic: true``
+#:   so that their keys are still accepted
+#: - ``norms`` - default ``norms`` of ``text`` fields
+#: - ``eager_global_ordinals`` - whether ``facet`` fields load global
+#:   ordinals at refresh time
+PROFILES = {
+    "default": {
+        "settings": {},
+        "dynamic": None,
+        "norms": None,
+        "eager_global_ordinals": False,
+    },
+    "write_heavy": {
+        "settings": {"index": {"refresh_interval": "30s", "number_of_replicas": 1}},
+        "dynamic": "strict",
+        "norms": False,
+        "eager_global_ordinals": False,
+    },
+    "search_heavy": {
+        "settings": {"index": {"refresh_interval": "1s", "number_of_replicas": 2}},
+        "dynamic": "strict",
+        "norms": None,
+        "eager_global_ordinals": True,
+    },
+}
+
+
+def get_profile(profile: typing.Union[str, dict, None]) -> dict:
+    """
+    Get mapping profile by name. Dictionary profiles are merged over the
+    ``default`` profile.
+
+    :param profile: profile name from :data:`PROFILES`, or profile dictionary
+
+    :return: profile dictionary
+    """
+    if profile is None:
+        return PROFILES["default"]
+    if isinstance(profile, str):
+        if profile not in PROFILES:
+            raise KeyError("Unknown mapping profile %s" % profile)
+        return PROFILES[profile]
+    result = dict(PROFILES["default"])
+    result.update(profile)
+    return result
+
+
+def _tune_field(mfield, meta, profile):
+    doc_values = meta.get("doc_values", None)
+    if doc_values is not None:
+        mfield["doc_values"] = doc_values
+    if mfield["type"] == "text":
+        norms = meta.get("norms", profile["norms"])
+        if norms is not None:
+            mfield["norms"] = norms
+    if meta.get("facet", None) and profile["eager_global_ordinals"]:
+        if mfield["type"] == "keyword":
+            mfield["eager_global_ordinals"] = True
+        elif mfield["type"] == "text":
+            mfield["fields"]["raw"]["eager_global_ordinals"] = True
+    return mfield
+
+
+def _free_object(mfield, profile):
+    # objects without declared properties, such as dict fields, would inherit
+    # strict dynamic mapping from the root and reject every document with keys
+    if profile["dynamic"] == "strict" and mfield["type"] != "flattened":
+        mfield["dynamic"] = True
+    return mfield
+
+
+OBJECT_TYPES = ("object", "nested", "flattened")
+
+
+def _scalar_mapping(typ, meta):
+    if typ in (date, datetime):
+        return {"type": "date"}
+    if typ == str:
+        fmt = meta.get("format", None)
+        if fmt is not None and (fmt == "text" or fmt.startswith("text/")):
+            return {"type": "text", "fields": {"raw": {"type": "keyword"}}}
+        return {"type": "keyword"}
+    if typ == int:
+        return {"type": "long"}
+    if typ == float:
+        return {"type": "double"}
+    if typ == bool:
+        return {"type": "boolean"}
+    return None
+
+
+def _object_mapping(schema, object_type, request, *, metadata, profile, _stack):
+    if object_type not in OBJECT_TYPES:
+        raise ValueError("Unknown object type %s" % object_type)
+    if object_type == "flattened":
+        return {"type": "flattened"}
+    if schema in _stack:
+        # recursive dataclass can't be expressed in mapping, keep it in
+        # _source without indexing it. enabled is only valid on object
+        return {"type": "object", "enabled": False}
+    return {
+        "type": object_type,
+        "properties": _properties(
+            schema,
+            request,
+            metadata=metadata,
+            profile=profile,
+            _stack=_stack + (schema,),
+        ),
+    }
+
+
+def _properties(
+    schema,
+    request,
+    *,
+    metadata,
+    profile,
+    include_fields=None,
+    exclude_fields=None,
+    _stack=(),
+):
+    include_fields = include_fields or []
+    exclude_fields = exclude_fields or []
+    mprops = {}
+    for attr, prop in dataclass_fields(schema).items():
+        if include_fields and prop.name not in include_fields:
+            continue
+        if prop.name in exclude_fields:
+            continue
+        mprops[attr] = dataclass_field_to_esmapping(
+            prop, schema, request, metadata=metadata, profile=profile, _stack=_stack
+        )
+    return mprops
 
 
 def dataclass_field_to_esmapping(
-    prop: dataclasses.Field, schema, request, *, metadata=None
+    prop: dataclasses.Field,
+    schema,
+    request,
+    *,
+    metadata=None,
+    profile=None,
+    _stack=(),
 ):
     t = dataclass_get_type(prop)
     metadata = metadata or {}
+    profile = get_profile(profile)
     meta = copy.deepcopy(t["metadata"])
     meta.update(metadata)
     index = meta.get("index", None)
     mapping_opts = meta.get("es.mapping_options", {})
     if index is not None:
         mapping_opts.setdefault("index", index)
-    if t["type"] == date:
-        mfield = {"type": "date"}
-        mfield.update(mapping_opts)
-        return mfield
-    if t["type"] == datetime:
-        mfield = {"type": "date"}
-        mfield.update(mapping_opts)
-        return mfield
-    if t["type"] == str:
-        fmt = meta.get("format", None)
-        if fmt is None:
-            mfield = {"type": "keyword"}
-        elif fmt == "text" or fmt.startswith("text/"):
-            mfield = {"type": "text", "fields": {"raw": {"type": "keyword"}}}
-        else:
-            mfield = {"type": "keyword"}
-        mfield.update(mapping_opts)
-        return mfield
-    if t["type"] == int:
-        mfield = {"type": "long"}
-        mfield.update(mapping_opts)
-        return mfield
-    if t["type"] == float:
-        mfield = {"type": "double"}
-        mfield.update(mapping_opts)
-        return mfield
-    if t["type"] == bool:
-        mfield = {"type": "boolean"}
+    mfield = _scalar_mapping(t["type"], meta)
+    if mfield is not None:
+        _tune_field(mfield, meta, profile)
         mfield.update(mapping_opts)
         return mfield
     if is_dataclass_field(prop):
-        mfield = {"type": "object"}
-        mfield.update(mapping_opts)
-    if t["type"] == dict:
-        mfield = {"type": "object"}
+        mfield = _object_mapping(
+            t["type"],
+            meta.get("es.object_type", "object"),
+            request,
+            metadata=metadata,
+            profile=profile,
+            _stack=_stack,
+        )
+        _tune_field(mfield, meta, profile)
         mfield.update(mapping_opts)
         return mfield
-    if t["type"] == list:
-        mfield = {"type": "nested"}
+    if t["type"] == dict:
+        mfield = _free_object({"type": "object"}, profile)
+        _tune_field(mfield, meta, profile)
         mfield.update(mapping_opts)
         return mfield
-    if t["type"] == set:
-        mfield = {"type": "nested"}
+    if t["type"] in (list, set):
+        # elasticsearch indexes arrays natively, so list of scalar is mapped
+        # as its item type. Only list of dataclass is nested by default.
+        item_type = t.get("schema", None)
+        object_type = meta.get("es.object_type", None)
+        mfield = None
+        if item_type is not None and object_type is None:
+            mfield = _scalar_mapping(item_type, meta)
+        if mfield is None:
+            if dataclasses.is_dataclass(item_type):
+                mfield = _object_mapping(
+                    item_type,
+                    object_type or "nested",
+                    request,
+                    metadata=metadata,
+                    profile=profile,
+                    _stack=_stack,
+                )
+            else:
+                mfield = _free_object({"type": object_type or "nested"}, profile)
+        _tune_field(mfield, meta, profile)
         mfield.update(mapping_opts)
         return mfield
     raise KeyError(prop)
@@ -72,25 +223,271 @@ def dc2esmapping(
     metadata: typing.Optional[dict] = None,
     include_fields=None,
     exclude_fields=None,
+    profile: typing.Union[str, dict, None] = None,
+    settings: typing.Optional[dict] = None,
 ):
+    """
+    Convert ``dataclass`` to elasticsearch index definition
 
-    include_fields = include_fields or []
-    exclude_fields = exclude_fields or []
-    mprops = {}
-    if include_fields:
-        for attr, prop in schema.__dataclass_fields__.items():
-            if prop.name in include_fields and prop.name not in exclude_fields:
-                mprops[attr] = dataclass_field_to_esmapping(
-                    prop, schema, request, metadata=metadata
-                )
-    else:
-        for attr, prop in schema.__dataclass_fields__.items():
-            if prop.name not in exclude_fields:
-                mprops[attr] = dataclass_field_to_esmapping(
-                    prop, schema, request, metadata=metadata
-                )
+    :param schema: ``dataclass`` class
+    :param request: request object, accepts Any
+    :param metadata: metadata applied to all fields
+    :param include_fields: List of field names to include
+    :param exclude_fields: List of field names to exclude
+    :param profile: mapping profile name from :data:`PROFILES`, such as
+                    ``write_heavy`` or ``search_heavy``, or profile dictionary
+    :param settings: index settings, merged over the profile settings
+
+    :return: dictionary with ``mappings``, and ``settings`` if any
+
+    **Metadata handling**
+
+    - ``index: bool`` - whether the field is searchable
+    - ``doc_values: bool`` - whether the field can be sorted and aggregated.
+      Fields that are only stored can disable both ``index`` and ``doc_values``
+    - ``norms: bool`` - whether ``text`` field keeps scoring norms, defaults
+      to the profile ``norms``
+    - ``facet: bool`` - field is used for aggregation, loads global ordinals
+      eagerly when the profile sets ``eager_global_ordinals``
+    - ``source_exclude: bool`` - exclude the field from ``_source``
+    - ``es.object_type: str`` - mapping type of nested ``dataclass`` field,
+      ``object`` (default), ``nested`` or ``flattened``. ``object`` and
+      ``nested`` map the properties of the ``dataclass`` recursively,
+      ``flattened`` maps the whole object as a single field, avoiding mapping
+      explosion. On ``list`` or ``set`` of ``dataclass`` it defaults to
+      ``nested``. ``list`` and ``set`` of scalar are mapped as their item type,
+      as elasticsearch indexes arrays natively
+    - ``es.mapping_options: dict`` - additional field mapping parameters,
+      overriding everything else
+    """
+
+    profile = get_profile(profile)
+    mprops = _properties(
+        schema,
+        request,
+        metadata=metadata,
+        profile=profile,
+        include_fields=include_fields,
+        exclude_fields=exclude_fields,
+        _stack=(schema,),
+    )
+    source_excludes = []
+    for attr, prop in dataclass_fields(schema).items():
+        if attr not in mprops:
+            continue
+        if prop.metadata.get("source_exclude", None) or (metadata or {}).get(
+            "source_exclude", None
+        ):
+            source_excludes.append(attr)
+
+    mappings = {"properties": mprops}
+    if profile["dynamic"] is not None:
+        mappings["dynamic"] = profile["dynamic"]
+    if source_excludes:
+        mappings["_source"] = {"excludes": source_excludes}
+    result = {"mappings": mappings}
+
+    index_settings = copy.deepcopy(profile["settings"])
+    for key, value in (settings or {}).items():
+        if isinstance(value, dict) and isinstance(index_settings.get(key), dict):
+            index_settings[key].update(value)
+        else:
+            index_settings[key] = value
+    if index_settings:
+        result["settings"] = index_settings
+    return result
+
+
+#: field mapping parameters that can be changed on existing field through
+#: the update mapping API
+UPDATABLE_PARAMETERS = (
+    "ignore_above",
+    "ignore_malformed",
+    "search_analyzer",
+    "search_quote_analyzer",
+    "eager_global_ordinals",
+    "dynamic",
+    "meta",
+)
+
+#: index settings that can't be changed on an open index
+STATIC_SETTINGS = (
+    "number_of_shards",
+    "number_of_routing_shards",
+    "routing_partition_size",
+    "codec",
+    "sort",
+    "analysis",
+)
+
+
+@dataclasses.dataclass
+class MappingDelta(object):
+    """
+    Difference between two index definitions produced by :func:`dc2esmapping`
+    """
+
+    #: body of update mapping request (``PUT <index>/_mapping``), containing
+    #: only new and changed fields, empty if there is nothing to update
+    mappings: dict = dataclasses.field(default_factory=dict)
+    #: body of update settings request (``PUT <index>/_settings``), containing
+    #: only changed dynamic settings
+    settings: dict = dataclasses.field(default_factory=dict)
+    #: list of changes that can't be applied in place. Each item contains
+    #: ``path``, ``reason``, ``old`` and ``new``
+    breaking: list = dataclasses.field(default_factory=list)
+    #: paths of fields that no longer exist. Elasticsearch can't remove
+    #: fields from mapping, these are left as is
+    removed: list = dataclasses.field(default_factory=list)
+
+    @property
+    def requires_reindex(self) -> bool:
+        return bool(self.breaking)
+
+
+def _field_type(mfield):
+    if "type" in mfield:
+        return mfield["type"]
+    if "properties" in mfield:
+        return "object"
+    return None
+
+
+def _join(path, name):
+    return "%s.%s" % (path, name) if path else name
 
-    return {"mappings": {"properties": mprops}}
+
+def _diff_properties(path, old, new, delta):
+    update = {}
+    for name, new_field in new.items():
+        if name not in old:
+            update[name] = copy.deepcopy(new_field)
+            continue
+        field_update = _diff_field(_join(path, name), old[name], new_field, delta)
+        if field_update:
+            update[name] = field_update
+    for name in old:
+        if name not in new:
+            delta.removed.append(_join(path, name))
+    return update
+
+
+def _diff_field(path, old, new, delta):
+    old_type = _field_type(old)
+    new_type = _field_type(new)
+    if old_type != new_type:
+        delta.breaking.append(
+            {"path": path, "reason": "type", "old": old_type, "new": new_type}
+        )
+        return None
+
+    changed = False
+    for key in set(old) | set(new):
+        if key in ("type", "properties", "fields"):
+            continue
+        old_value, new_value = old.get(key, None), new.get(key, None)
+        if old_value == new_value:
+            continue
+        if key in UPDATABLE_PARAMETERS or (key == "norms" and new_value is False):
+            changed = True
+        else:
+            delta.breaking.append(
+                {
+                    "path": path or key,
+                    "reason": key,
+                    "old": old_value,
+                    "new": new_value,
+                }
+            )
+
+    fields_update = _diff_properties(
+        path, old.get("fields", {}), new.get("fields", {}), delta
+    )
+    properties_update = _diff_properties(
+        path, old.get("properties", {}), new.get("properties", {}), delta
+    )
+
+    update = None
+    if changed or fields_update:
+        update = {k: copy.deepcopy(v) for k, v in new.items() if k != "properties"}
+    if properties_update:
+        if update is None:
+            update = {"type": new_type} if "type" in new else {}
+        update["properties"] = properties_update
+    return update
+
+
+def _flatten_settings(settings, prefix=""):
+    result = {}
+    for key, value in settings.items():
+        key = _join(prefix, key)
+        if isinstance(value, dict):
+            result.update(_flatten_settings(value, key))
+        else:
+            result[key] = value
+    return result
+
+
+def _index_settings(definition):
+    result = {}
+    for key, value in _flatten_settings(definition.get("settings", {})).items():
+        if key.startswith("index."):
+            key = key[len("index.") :]
+        result[key] = value
+    return result
+
+
+def mapping_delta(old: dict, new: dict) -> MappingDelta:
+    """
+    Compare two index definitions produced by :func:`dc2esmapping`, and get
+    the minimal update that turns ``old`` into ``new``, or the list of
+    breaking changes that require reindexing.
+
+    Adding fields, object properties and multi-fields, and changing
+    :data:`UPDATABLE_PARAMETERS` are applied through the update mapping API.
+    Changing a field type (including ``object`` to ``nested``), analyzer or
+    any other parameter, ``_source`` options, or :data:`STATIC_SETTINGS`
+    is breaking.
+
+    :param old: current index definition
+    :param new: new index definition
+
+    :return: :class:`MappingDelta`
+
+    .. code-block:: python
+
+       delta = mapping_delta(dc2esmapping(OldData), dc2esmapping(NewData))
+       if delta.requires_reindex:
+           ...
+       elif delta.mappings:
+           es.indices.put_mapping(index='mydata', body=delta.mappings)
+    """
+    delta = MappingDelta()
+    old_mappings = old.get("mappings", {})
+    new_mappings = new.get("mappings", {})
+    root_update = _diff_field("", old_mappings, new_mappings, delta)
+    if root_update:
+        delta.mappings = root_update
+
+    old_settings = _index_settings(old)
+    new_settings = _index_settings(new)
+    for key in sorted(set(old_settings) | set(new_settings)):
+        old_value = old_settings.get(key, None)
+        new_value = new_settings.get(key, None)
+        if old_value == new_value:
+            continue
+        if key.split(".")[0] in STATIC_SETTINGS:
+            delta.breaking.append(
+                {
+                    "path": "settings.index.%s" % key,
+                    "reason": "static setting",
+                    "old": old_value,
+                    "new": new_value,
+                }
+            )
+        else:
+            delta.settings.setdefault("index", {})[key] = new_value
+    return delta
 
 
 convert = dc2esmapping
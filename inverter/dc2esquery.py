@@ -0,0 +1,236 @@
+import typing
+import weakref
+from datetime import date, datetime
+
+import pytz
+
+from .dc2esmapping import dc2esmapping
+
+#: supported filter operators
+OPERATORS = (
+    "==",
+    "!=",
+    "in",
+    "not in",
+    "<",
+    "<=",
+    ">",
+    ">=",
+    "match",
+    "exists",
+)
+
+_RANGE_OPERATORS = {"<": "lt", "<=": "lte", ">": "gt", ">=": "gte"}
+
+_RANGE_TYPES = ("long", "double", "date", "keyword")
+
+_mapped_fields = weakref.WeakKeyDictionary()
+_templates = weakref.WeakKeyDictionary()
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return value.astimezone(pytz.UTC).isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _index_fields(properties, prefix, nested_path, result):
+    for name, mfield in properties.items():
+        path = "%s.%s" % (prefix, name) if prefix else name
+        ftype = mfield.get("type", "object")
+        if ftype in ("object", "nested"):
+            if mfield.get("enabled", True) is False:
+                result[path] = {"type": None, "nested": nested_path}
+                continue
+            _index_fields(
+                mfield.get("properties", {}),
+                path,
+                path if ftype == "nested" else nested_path,
+                result,
+            )
+            continue
+        result[path] = {
+            "type": ftype,
+            "nested": nested_path,
+            "raw": "raw" in mfield.get("fields", {}),
+        }
+    return result
+
+
+def _field_info(fields, name):
+    if name in fields:
+        return fields[name]
+    # sub key of flattened field
+    parts = name.split(".")
+    for i in range(len(parts) - 1, 0, -1):
+        parent = fields.get(".".join(parts[:i]), None)
+        if parent is not None and parent["type"] == "flattened":
+            return {"type": "keyword", "nested": parent["nested"], "raw": False}
+    raise KeyError("Unknown field %s" % name)
+
+
+def _clause(name, info, op):
+    """
+    Get ``(context, builder)`` for a filter. ``builder`` accepts the filter
+    value and returns the query clause.
+    """
+    ftype = info["type"]
+    if ftype is None:
+        raise ValueError("Field %s is not indexed" % name)
+
+    if op == "exists":
+        return "exists", lambda value: {"exists": {"field": name}}
+
+    if op == "match":
+        if ftype != "text":
+            raise ValueError("match is only supported on text field %s" % name)
+        return "must", lambda value: {"match": {name: value}}
+
+    exact = name
+    if ftype == "text":
+        if not info["raw"]:
+            raise ValueError("Exact match is not supported on text field %s" % name)
+        exact = "%s.raw" % name
+
+    if op in ("==", "!="):
+        context = "filter" if op == "==" else "must_not"
+        return context, lambda value: {"term": {exact: _encode_value(value)}}
+
+    if op in ("in", "not in"):
+        context = "filter" if op == "in" else "must_not"
+        return context, lambda value: {
+            "terms": {exact: [_encode_value(v) for v in value]}
+        }
+
+    if op in _RANGE_OPERATORS:
+        if ftype not in _RANGE_TYPES:
+            raise ValueError("Range is not supported on %s field %s" % (ftype, name))
+        key = _RANGE_OPERATORS[op]
+        return "filter", lambda value: {"range": {name: {key: _encode_value(value)}}}
+
+    raise ValueError("Unknown operator %s" % op)
+
+
+def _merge_ranges(clauses):
+    result = []
+    ranges = {}
+    for clause in clauses:
+        if "range" in clause:
+            ((name, bounds),) = clause["range"].items()
+            if name in ranges:
+                ranges[name].update(bounds)
+                continue
+            ranges[name] = dict(bounds)
+            clause = {"range": {name: ranges[name]}}
+        result.append(clause)
+    return result
+
+
+def _mapped_fields_of(schema):
+    if schema not in _mapped_fields:
+        properties = dc2esmapping(schema)["mappings"]["properties"]
+        _mapped_fields[schema] = _index_fields(properties, "", None, {})
+    return _mapped_fields[schema]
+
+
+def _compile_template(schema, shape):
+    fields = _mapped_fields_of(schema)
+    builders = []
+    for name, op in shape:
+        if op not in OPERATORS:
+            raise ValueError("Unknown operator %s" % op)
+        info = _field_info(fields, name)
+        context, builder = _clause(name, info, op)
+        builders.append((context, info["nested"], builder))
+
+    def template(values):
+        groups = {"filter": {}, "must": {}, "must_not": []}
+        for (context, nested, builder), value in zip(builders, values):
+            if context == "exists":
+                context = "filter" if value else "must_not"
+            clause = builder(value)
+            if context == "must_not":
+                if nested:
+                    clause = {
+                        "nested": {
+                            "path": nested,
+                            "query": {"bool": {"filter": [clause]}},
+                        }
+                    }
+                groups["must_not"].append(clause)
+            else:
+                groups[context].setdefault(nested, []).append(clause)
+
+        query = {}
+        for context in ("filter", "must"):
+            clauses = []
+            for nested, nested_clauses in groups[context].items():
+                nested_clauses = _merge_ranges(nested_clauses)
+                if nested:
+                    clauses.append(
+                        {
+                            "nested": {
+                                "path": nested,
+                                "query": {"bool": {context: nested_clauses}},
+                            }
+                        }
+                    )
+                else:
+                    clauses.extend(nested_clauses)
+            if clauses:
+                query[context] = clauses
+        if groups["must_not"]:
+            query["must_not"] = groups["must_not"]
+        return {"bool": query}
+
+    return template
+
+
+def dc2esquery(
+    schema,
+    filters: typing.List[typing.Tuple[str, str, typing.Any]],
+) -> dict:
+    """
+    Compile filter expressions into ElasticSearch query DSL, matching the
+    mapping produced by ``inverter.dc2esmapping``.
+
+    Filters are combined with ``AND``. Exact and range filters are placed in
+    ``filter`` context so that they are cached and not scored:
+
+    - ``==``, ``!=`` use ``term``, ``in``, ``not in`` use ``terms``. On
+      ``text`` fields, the ``raw`` keyword sub-field is used
+    - ``<``, ``<=``, ``>``, ``>=`` use ``range``, filters on the same field
+      are merged into a single ``range``
+    - ``match`` uses ``match`` on ``text`` field, in scoring ``must`` context
+    - ``exists`` uses ``exists``, value ``False`` matches missing field
+
+    Filters on fields inside ``nested`` objects are wrapped in ``nested``
+    query, filters on the same nested path are grouped so that they match
+    the same nested object.
+
+    Query templates are compiled once per ``dataclass`` and filter fields and
+    operators, and cached.
+
+    :param schema: ``dataclass`` class
+    :param filters: list of ``(field, operator, value)``. Fields of nested
+                    ``dataclass`` are referred using dotted name, eg:
+                    ``address.city``
+
+    :return: ``bool`` query dictionary
+
+    .. code-block:: python
+
+       query = dc2esquery(MyData, [('status', 'in', ['new', 'open']),
+                                   ('created', '>=', date(2021, 1, 1))])
+       es.search(index='mydata', body={'query': query})
+    """
+    shape = tuple((name, op) for name, op, value in filters)
+    templates = _templates.setdefault(schema, {})
+    if shape not in templates:
+        templates[shape] = _compile_template(schema, shape)
+    return templates[shape]([value for name, op, value in filters])
+
+
+convert = dc2esquery
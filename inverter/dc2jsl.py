@@ -4,7 +4,12 @@ from datetime import date, datetime
 
 import jsl
 
-from .common import dataclass_check_type, dataclass_get_type, is_dataclass_field
+from .common import (
+    dataclass_check_type,
+    dataclass_fields,
+    dataclass_get_type,
+    is_dataclass_field,
+)
 
 
 def _set_nullable(prop):
@@ -13,20 +18,61 @@ def _set_nullable(prop):
     return prop
 
 
+class InternedDocumentField(jsl.DocumentField):
+    """
+    ``jsl.DocumentField`` that looks up its document class from the subschema
+    cache on access. This allows referencing a document class that is still
+    being built, such as on recursive ``dataclass``.
+
+    :meta private:
+    """
+
+    def __init__(self, subschema_cache, key, **kwargs):
+        self.subschema_cache = subschema_cache
+        self.key = key
+        super().__init__(document_cls=None, **kwargs)
+
+    @property
+    def document_cls(self):
+        return self.subschema_cache[self.key]
+
+
 def dc2jsl(
-    schema, *, ignore_required=False, additional_properties=False, mode="default"
+    schema,
+    *,
+    ignore_required=False,
+    additional_properties=False,
+    mode="default",
+    definitions=False,
+    subschema_cache=None,
 ):
     """
     Convert ``dataclass`` to ``jsl`` JSON Schema.
 
+    Nested ``dataclass`` are converted once per conversion and shared by all
+    fields that use them. Recursive ``dataclass`` are emitted as ``$ref``.
+
     :param schema: ``dataclass`` class
     :param ignore_required: if ``True``, set all fields as nullable
     :param additional_properties: Allow ``additional_properties`` in JSON Schema
     :param mode: mode flag
+    :param definitions: if ``True``, emit each nested ``dataclass`` once in
+                        ``definitions`` and refer to it with ``$ref``, instead
+                        of inlining it on every field
+    :param subschema_cache: dictionary to intern converted nested ``dataclass`` in.
+                            Pass a long lived dictionary to share it across conversions.
 
     :return: ``jsl.Document`` class
     """
 
+    if subschema_cache is None:
+        subschema_cache = {}
+
+    key = (schema, ignore_required, additional_properties, mode, definitions)
+    if subschema_cache.get(key, None) is not None:
+        return subschema_cache[key]
+    subschema_cache[key] = None
+
     nullable = ignore_required
     attrs = {}
 
@@ -34,9 +80,16 @@ def dc2jsl(
 
     class Options(object):
         additional_properties = _additional_properties
-
-    for attr, prop in schema.__dataclass_fields__.items():
-        prop = dataclass_field_to_jsl_field(prop, nullable=nullable, mode=mode)
+        definition_id = "%s.%s" % (schema.__module__, schema.__qualname__)
+
+    for attr, prop in dataclass_fields(schema).items():
+        prop = dataclass_field_to_jsl_field(
+            prop,
+            nullable=nullable,
+            mode=mode,
+            subschema_cache=subschema_cache,
+            definitions=definitions,
+        )
         if nullable:
             attrs[attr] = _set_nullable(prop)
         else:
@@ -50,14 +103,41 @@ def dc2jsl(
 
     attrs["Options"] = Options
     Schema = type("Schema", (jsl.Document,), attrs)
+    subschema_cache[key] = Schema
 
     return Schema
 
 
+def _subschema_field(schema, nullable, mode, subschema_cache, definitions, **kwargs):
+    key = (schema, nullable, False, mode, definitions)
+    if key not in subschema_cache:
+        dc2jsl(
+            schema,
+            ignore_required=nullable,
+            mode=mode,
+            definitions=definitions,
+            subschema_cache=subschema_cache,
+        )
+    if subschema_cache[key] is None:
+        return InternedDocumentField(
+            subschema_cache, key, as_ref=definitions, **kwargs
+        )
+    return jsl.DocumentField(
+        document_cls=subschema_cache[key], as_ref=definitions, **kwargs
+    )
+
+
 def dataclass_field_to_jsl_field(
-    prop: dataclasses.Field, nullable=False, mode="default"
+    prop: dataclasses.Field,
+    nullable=False,
+    mode="default",
+    subschema_cache=None,
+    definitions=False,
 ) -> jsl.BaseField:
 
+    if subschema_cache is None:
+        subschema_cache = {}
+
     if mode in ["edit", "edit-process"]:
         update_mode = True
     else:
@@ -108,18 +188,17 @@ def dataclass_field_to_jsl_field(
     if t:
         if update_mode:
             t["required"] = False
-        subtype = dc2jsl(t["schema"], nullable=nullable)
-        return jsl.DocumentField(
-            name=prop.name, document_cls=subtype, required=t["required"]
+        return _subschema_field(
+            t["type"],
+            nullable,
+            mode,
+            subschema_cache,
+            definitions,
+            name=prop.name,
+            required=t["required"],
         )
 
     t = dataclass_check_type(prop, list)
-    if t:
-        if update_mode:
-            t["required"] = False
-        return jsl.ArrayField(name=prop.name, required=t["required"])
-
-    t = dataclass_check_type(prop, typing.List)
     if t:
         if update_mode:
             t["required"] = False
@@ -128,20 +207,24 @@ def dataclass_field_to_jsl_field(
             return jsl.ArrayField(name=prop.name, required=t["required"])
 
         if dataclasses.is_dataclass(t["schema"]):
-            subtype = jsl.DocumentField(
-                document_cls=dc2jsl(t["schema"], nullable=nullable)
+            subtype = _subschema_field(
+                t["schema"], nullable, mode, subschema_cache, definitions
             )
+        elif t["schema"] in (date, datetime):
+            subtype = jsl.DateTimeField()
+        elif t["schema"] == bool:
+            subtype = jsl.BooleanField()
         elif t["schema"] == str:
-            subtype = jsl.StringField(name=prop.name)
+            subtype = jsl.StringField()
         elif t["schema"] == int:
-            subtype = jsl.IntField(name=prop.name)
+            subtype = jsl.IntField()
         elif t["schema"] == float:
-            subtype = jsl.NumberField(name=prop.name)
+            subtype = jsl.NumberField()
         elif t["schema"] == dict:
-            subtype = jsl.DictField(name=prop.name)
+            subtype = jsl.DictField()
         else:
-            raise KeyError(t["schema"])
-        return jsl.ArrayField(items=subtype, required=t["required"])
+            return jsl.ArrayField(name=prop.name, required=t["required"])
+        return jsl.ArrayField(name=prop.name, items=subtype, required=t["required"])
 
     raise KeyError(prop)
 
@@ -0,0 +1,186 @@
+import dataclasses
+import typing
+import weakref
+from datetime import date, datetime
+
+from .common import dataclass_fields, dataclass_get_type
+
+SCHEMA_URI = "http://json-schema.org/draft-04/schema#"
+
+_cache = weakref.WeakKeyDictionary()
+
+
+def _scalar_schema(typ):
+    if typ in (date, datetime):
+        return {"type": "string", "format": "date-time"}
+    if typ == bool:
+        return {"type": "boolean"}
+    if typ == str:
+        return {"type": "string"}
+    if typ == int:
+        return {"type": "integer"}
+    if typ == float:
+        return {"type": "number"}
+    if typ == dict:
+        return {"type": "object"}
+    return None
+
+
+def _nested_dataclasses(prop):
+    t = dataclass_get_type(prop)
+    if dataclasses.is_dataclass(t["type"]):
+        return [t["type"]]
+    if t["type"] == list and dataclasses.is_dataclass(t.get("schema", None)):
+        return [t["schema"]]
+    return []
+
+
+def recursive_dataclasses(schema) -> typing.Set[type]:
+    """
+    Get nested ``dataclass`` of ``schema`` that refer to themselves, directly
+    or through other ``dataclass``. These can't be inlined, and are emitted in
+    ``definitions``.
+
+    :param schema: ``dataclass`` class
+
+    :return: set of ``dataclass`` classes
+    """
+    result = set()
+    done = set()
+
+    def visit(current, stack):
+        stack.append(current)
+        for prop in dataclass_fields(current).values():
+            for sub in _nested_dataclasses(prop):
+                if sub in stack:
+                    result.add(sub)
+                elif sub not in done:
+                    visit(sub, stack)
+        stack.pop()
+        done.add(current)
+
+    visit(schema, [])
+    return result
+
+
+def definition_id(schema) -> str:
+    """
+    Get the ``definitions`` key of ``schema``, same as ``inverter.dc2jsl``
+    """
+    return "%s.%s" % (schema.__module__, schema.__qualname__)
+
+
+def _set_nullable(fschema):
+    if "$ref" in fschema:
+        return {"anyOf": [fschema, {"type": "null"}]}
+    fschema["type"] = [fschema["type"], "null"]
+    return fschema
+
+
+class _Builder(object):
+    def __init__(self, schema, ignore_required, mode, as_ref=False):
+        self.nullable = ignore_required
+        self.update_mode = mode in ["edit", "edit-process"]
+        self.recursive = recursive_dataclasses(schema)
+        self.as_ref = as_ref
+        self.definitions = {}
+
+    def ref(self, schema):
+        key = definition_id(schema)
+        if key not in self.definitions:
+            # registered before building, so that recursion resolves to it
+            self.definitions[key] = None
+            self.definitions[key] = self.document(schema, False)
+        return {"$ref": "#/definitions/%s" % key}
+
+    def nested(self, schema):
+        if self.as_ref or schema in self.recursive:
+            return self.ref(schema)
+        return self.document(schema, False)
+
+    def field(self, prop):
+        t = dataclass_get_type(prop)
+        required = t["required"] and not self.update_mode
+        fschema = _scalar_schema(t["type"])
+        if fschema is not None and t["type"] in (date, datetime, str):
+            if required and not self.nullable:
+                fschema["pattern"] = ".+"
+        elif fschema is None and dataclasses.is_dataclass(t["type"]):
+            fschema = self.nested(t["type"])
+        elif fschema is None and t["type"] == list:
+            fschema = {"type": "array"}
+            item_type = t.get("schema", None)
+            if dataclasses.is_dataclass(item_type):
+                fschema["items"] = self.nested(item_type)
+            elif _scalar_schema(item_type) is not None:
+                fschema["items"] = _scalar_schema(item_type)
+        elif fschema is None:
+            raise KeyError(prop)
+        if self.nullable and not required:
+            fschema = _set_nullable(fschema)
+        return fschema, required
+
+    def document(self, schema, additional_properties):
+        properties = {}
+        required = []
+        for attr, prop in dataclass_fields(schema).items():
+            properties[attr], field_required = self.field(prop)
+            if field_required:
+                required.append(attr)
+        result = {"type": "object", "properties": properties}
+        if required:
+            result["required"] = required
+        result["additionalProperties"] = additional_properties
+        return result
+
+
+def dc2jsonschema(
+    schema,
+    *,
+    ignore_required=False,
+    additional_properties=False,
+    mode="default",
+    definitions=False,
+) -> dict:
+    """
+    Convert ``dataclass`` to JSON Schema dictionary directly, without building
+    ``jsl`` document.
+
+    Accepts the same parameters as ``inverter.dc2jsl.convert``, and produces
+    the same schema as its ``get_schema()``, except that nullable fields use
+    the compact ``"type": [..., "null"]`` form instead of ``oneOf``.
+
+    The result is cached per ``dataclass`` and parameters, and shared between
+    callers. It must not be modified.
+
+    :param schema: ``dataclass`` class
+    :param ignore_required: if ``True``, set all fields as nullable
+    :param additional_properties: Allow ``additional_properties`` in JSON Schema
+    :param mode: mode flag
+    :param definitions: if ``True``, emit each nested ``dataclass`` once in
+                        ``definitions`` and refer to it with ``$ref``
+
+    :return: JSON Schema dictionary
+    """
+    key = (ignore_required, additional_properties, mode, definitions)
+    cache = _cache.setdefault(schema, {})
+    if key in cache:
+        return cache[key]
+
+    builder = _Builder(schema, ignore_required, mode, as_ref=definitions)
+    result = {"$schema": SCHEMA_URI}
+    if schema in builder.recursive and not additional_properties:
+        ref = builder.ref(schema)
+        result["definitions"] = builder.definitions
+        result.update(ref)
+    else:
+        document = builder.document(schema, additional_properties)
+        if builder.definitions:
+            result["definitions"] = builder.definitions
+        result.update(document)
+
+    cache[key] = result
+    return result
+
+
+convert = dc2jsonschema
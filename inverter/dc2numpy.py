@@ -0,0 +1,270 @@
+import typing
+from datetime import date, datetime
+
+import colander
+import pytz
+
+try:
+    import numpy
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        "inverter.dc2numpy requires numpy, install inverter[numpy]"
+    ) from e
+
+from .common import dataclass_fields, dataclass_get_type
+
+#: field types that are converted column-wise, other types are passed through
+COLUMN_TYPES = (bool, int, float, date, datetime)
+
+_DTYPES = {
+    bool: "bool",
+    int: "int64",
+    float: "float64",
+    date: "datetime64[D]",
+    datetime: "datetime64[ms]",
+}
+
+_FILL_VALUES = {
+    bool: False,
+    int: 0,
+    float: 0.0,
+    date: 0,
+    datetime: 0,
+}
+
+
+def _get_fields(schema, include_fields=None, exclude_fields=None):
+    include_fields = include_fields or []
+    exclude_fields = exclude_fields or []
+    result = []
+    for attr, prop in dataclass_fields(schema).items():
+        if include_fields and attr not in include_fields:
+            continue
+        if attr in exclude_fields:
+            continue
+        t = dataclass_get_type(prop)
+        result.append((attr, t))
+    return result
+
+
+def _to_datetime64(value):
+    if isinstance(value, str):
+        value = colander.iso8601.parse_date(value)
+    if isinstance(value, datetime):
+        return value.astimezone(pytz.UTC).replace(tzinfo=None)
+    return value
+
+
+def _mask(values):
+    return numpy.fromiter((v is None for v in values), dtype=bool, count=len(values))
+
+
+def _column(values, typ, required):
+    """
+    Build a numpy array of ``typ`` from ``values``. Optional fields
+    are returned as ``numpy.ma.MaskedArray`` with ``None`` masked.
+    """
+    mask = _mask(values)
+    fill = _FILL_VALUES[typ]
+    if mask.any():
+        values = [fill if v is None else v for v in values]
+    if typ == datetime:
+        values = [_to_datetime64(v) for v in values]
+    array = numpy.array(values, dtype=_DTYPES[typ])
+    if required:
+        if mask.any():
+            raise ValueError("Required column contains null values")
+        return array
+    return numpy.ma.MaskedArray(array, mask=mask)
+
+
+def _split_columns(schema, records, include_fields=None, exclude_fields=None):
+    records = list(records)
+    fields = _get_fields(schema, include_fields, exclude_fields)
+    columns = {}
+    for attr, t in fields:
+        columns[attr] = [r.get(attr, None) for r in records]
+    return fields, columns
+
+
+def _mask_of(array):
+    if isinstance(array, numpy.ma.MaskedArray):
+        return numpy.ma.getmaskarray(array)
+    return None
+
+
+def _to_pylist(array, typ, default_tzinfo):
+    mask = _mask_of(array)
+    data = numpy.ma.getdata(array)
+    if typ == datetime:
+        values = [
+            pytz.UTC.localize(v).astimezone(default_tzinfo)
+            for v in data.astype("datetime64[ms]").astype(object)
+        ]
+    else:
+        values = data.tolist()
+    if mask is not None and mask.any():
+        for idx in numpy.flatnonzero(mask).tolist():
+            values[idx] = None
+    return values
+
+
+def columns_to_records(columns: typing.Dict[str, typing.Any]) -> typing.List[dict]:
+    """
+    Transpose a dictionary of columns into a list of per-record dictionaries.
+    Masked array values are returned as ``None``.
+
+    :param columns: dictionary of field name to ``numpy.ndarray`` or ``list``
+
+    :return: list of dictionaries
+    """
+    names = list(columns.keys())
+    lists = []
+    for name in names:
+        col = columns[name]
+        if isinstance(col, numpy.ndarray):
+            mask = _mask_of(col)
+            values = numpy.ma.getdata(col).tolist()
+            if mask is not None and mask.any():
+                for idx in numpy.flatnonzero(mask).tolist():
+                    values[idx] = None
+            col = values
+        lists.append(col)
+    return [dict(zip(names, row)) for row in zip(*lists)]
+
+
+def dc2numpy(
+    schema: type,
+    records: typing.Iterable[dict],
+    *,
+    include_fields: typing.List[str] = None,
+    exclude_fields: typing.List[str] = None,
+) -> typing.Dict[str, typing.Any]:
+    """
+    Converts a list of ``appstruct`` dictionaries into ``numpy`` columns,
+    using ``dataclass`` field types to decide the column dtype.
+
+    - ``int`` is converted to ``int64``
+    - ``float`` is converted to ``float64``
+    - ``bool`` is converted to ``bool``
+    - ``date`` is converted to ``datetime64[D]``
+    - ``datetime`` is converted to ``datetime64[ms]`` in UTC
+
+    Optional fields are returned as ``numpy.ma.MaskedArray`` where ``None``
+    values are masked. Fields of other types are returned as plain lists.
+
+    :param schema: ``dataclass`` class
+    :param records: iterable of ``appstruct`` dictionaries
+    :param include_fields: List of field names to include
+    :type include_fields: typing.List[str]
+    :param exclude_fields: List of field names to exclude
+    :type exclude_fields: typing.List[str]
+
+    :return: dictionary of field name to column
+    """
+    fields, columns = _split_columns(schema, records, include_fields, exclude_fields)
+    result = {}
+    for attr, t in fields:
+        if t["type"] in COLUMN_TYPES:
+            result[attr] = _column(columns[attr], t["type"], t["required"])
+        else:
+            result[attr] = columns[attr]
+    return result
+
+
+def serialize(
+    schema: type,
+    appstructs: typing.Iterable[dict],
+    *,
+    output: str = "records",
+    include_fields: typing.List[str] = None,
+    exclude_fields: typing.List[str] = None,
+):
+    """
+    Serialize a list of ``appstruct`` dictionaries in bulk, following the same
+    rules as ``inverter.dc2colanderjson``.
+
+    - date is serialized as number days from epoch
+    - datetime is serialized as number of miliseconds from epoch
+
+    Fields of other types are passed through unchanged.
+
+    :param schema: ``dataclass`` class
+    :param appstructs: iterable of ``appstruct`` dictionaries
+    :param output: ``'records'`` to return list of dictionaries, ``'columns'``
+                   to return dictionary of ``numpy`` columns
+    :param include_fields: List of field names to include
+    :param exclude_fields: List of field names to exclude
+
+    :return: list of ``cstruct`` dictionaries, or dictionary of columns
+    """
+    columns = dc2numpy(
+        schema,
+        appstructs,
+        include_fields=include_fields,
+        exclude_fields=exclude_fields,
+    )
+    for attr, t in _get_fields(schema, include_fields, exclude_fields):
+        if t["type"] in (date, datetime):
+            col = columns[attr]
+            data = numpy.ma.getdata(col).astype("int64")
+            mask = _mask_of(col)
+            if mask is not None:
+                data = numpy.ma.MaskedArray(data, mask=mask)
+            columns[attr] = data
+    if output == "columns":
+        return columns
+    if output == "records":
+        return columns_to_records(columns)
+    raise ValueError("Unknown output %s" % output)
+
+
+def deserialize(
+    schema: type,
+    cstructs: typing.Iterable[dict],
+    *,
+    output: str = "records",
+    include_fields: typing.List[str] = None,
+    exclude_fields: typing.List[str] = None,
+    default_tzinfo=pytz.UTC,
+):
+    """
+    Deserialize a list of ``cstruct`` dictionaries produced by
+    ``inverter.dc2colanderjson`` (or by :func:`serialize`) in bulk.
+
+    - date is deserialized from number of days from epoch, or ISO date string
+    - datetime is deserialized from number of miliseconds from epoch, or ISO
+      datetime string
+
+    Fields of other types are passed through unchanged.
+
+    :param schema: ``dataclass`` class
+    :param cstructs: iterable of ``cstruct`` dictionaries
+    :param output: ``'records'`` to return list of dictionaries, ``'columns'``
+                   to return dictionary of ``numpy`` columns
+    :param include_fields: List of field names to include
+    :param exclude_fields: List of field names to exclude
+    :param default_tzinfo: timezone of the ``datetime`` values in ``'records'``
+                           output, defaults to ``pytz.UTC``
+
+    :return: list of ``appstruct`` dictionaries, or dictionary of columns
+    """
+    result = dc2numpy(
+        schema,
+        cstructs,
+        include_fields=include_fields,
+        exclude_fields=exclude_fields,
+    )
+
+    if output == "columns":
+        return result
+    if output != "records":
+        raise ValueError("Unknown output %s" % output)
+
+    for attr, t in _get_fields(schema, include_fields, exclude_fields):
+        if t["type"] in COLUMN_TYPES:
+            result[attr] = _to_pylist(result[attr], t["type"], default_tzinfo)
+    return [dict(zip(result.keys(), row)) for row in zip(*result.values())]
+
+
+convert = dc2numpy
@@ -1,8 +1,10 @@
 import copy
 import dataclasses
+import json
 import typing
+import weakref
 from dataclasses import field
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from importlib import import_module
 
 import colander
@@ -11,8 +13,71 @@ import sqlalchemy_jsonfield as sajson
 import sqlalchemy_utils as sautils
 from deform.widget import HiddenWidget
 from pkg_resources import resource_filename
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.compiler import compiles
 
-from .common import dataclass_check_type, dataclass_get_type, is_dataclass_field
+from .common import (
+    dataclass_check_type,
+    dataclass_fields,
+    dataclass_get_type,
+    is_dataclass_field,
+)
+
+_FIELD_INDEX_KEYS = ("index_using", "index_where", "index_include", "index_with")
+
+
+def _has_field_index(metadata):
+    return any(metadata.get(k, None) for k in _FIELD_INDEX_KEYS)
+
+
+def create_index(
+    table: sqlalchemy.Table,
+    columns: typing.List[str],
+    *,
+    name: typing.Optional[str] = None,
+    unique: bool = False,
+    using: typing.Optional[str] = None,
+    where: typing.Optional[str] = None,
+    include: typing.Optional[typing.List[str]] = None,
+    ops: typing.Optional[typing.Dict[str, str]] = None,
+    with_: typing.Optional[dict] = None,
+) -> sqlalchemy.Index:
+    """
+    Create ``sqlalchemy.Index`` on ``table`` with PostgreSQL specific options
+
+    :param table: ``sqlalchemy.Table`` object
+    :param columns: list of column names, in index order
+    :param name: index name, defaults to ``ix_<table>_<columns>``
+    :param unique: flag on whether the index is unique
+    :param using: index method, eg: ``btree``, ``brin``, ``gin``, ``hash``
+    :param where: SQL predicate for partial index
+    :param include: list of column names for covering index ``INCLUDE``
+    :param ops: dictionary of column name to operator class
+    :param with_: dictionary of index storage parameters, eg: ``{'pages_per_range': 32}``
+
+    :return: ``sqlalchemy.Index`` object
+    """
+    if unique and using not in (None, "btree"):
+        raise ValueError("Unique index is only supported by btree, got %s" % using)
+    if name is None:
+        name = "ix_%s_%s" % (table.name, "_".join(columns))
+        if using:
+            name = "%s_%s" % (name, using)
+    kwargs = {}
+    if using:
+        kwargs["postgresql_using"] = using
+    if where:
+        kwargs["postgresql_where"] = sqlalchemy.text(where)
+    if include:
+        kwargs["postgresql_include"] = list(include)
+    if ops:
+        kwargs["postgresql_ops"] = ops
+    if with_:
+        kwargs["postgresql_with"] = with_
+    return sqlalchemy.Index(
+        name, *[table.c[c] for c in columns], unique=unique, **kwargs
+    )
 
 
 def sqlalchemy_params(prop, typ, **kwargs):
@@ -29,7 +94,7 @@ def sqlalchemy_params(prop, typ, **kwargs):
     if t["metadata"].get("primary_key", None) is True:
         params["primary_key"] = True
 
-    if t["metadata"].get("index", None) is True:
+    if t["metadata"].get("index", None) is True and not _has_field_index(t["metadata"]):
         params["index"] = True
 
     if t["metadata"].get("autoincrement", None) is True:
@@ -42,8 +107,63 @@ def sqlalchemy_params(prop, typ, **kwargs):
     return params
 
 
-def dataclass_field_to_sqla_col(prop: dataclasses.Field) -> sqlalchemy.Column:
+def _use_jsonb(meta, jsonb):
+    return jsonb or bool(meta.get("jsonb_index", None))
+
+
+_ARRAY_ITEM_TYPES = {
+    str: sqlalchemy.String,
+    int: sqlalchemy.Integer,
+    float: sqlalchemy.Float,
+    bool: sqlalchemy.Boolean,
+    date: sqlalchemy.Date,
+    datetime: lambda: sqlalchemy.DateTime(timezone=True),
+}
+
+
+def _array_item_type(t):
+    item_type = t.get("schema", None)
+    if item_type not in _ARRAY_ITEM_TYPES:
+        return None
+    if item_type == int and t["metadata"].get("format", None) == "bigint":
+        return sqlalchemy.BigInteger()
+    return _ARRAY_ITEM_TYPES[item_type]()
+
+
+def dataclass_field_to_sqla_col(
+    prop: dataclasses.Field, jsonb: bool = False, arrays: bool = False
+) -> sqlalchemy.Column:
     t = dataclass_get_type(prop)
+    using = t["metadata"].get("index_using", None)
+    if t["metadata"].get("unique", None) is True and using not in (None, "btree"):
+        raise ValueError(
+            "Unique column requires btree index, got index_using=%s on %s"
+            % (using, prop.name)
+        )
+    if t["metadata"].get("jsonb_index", None):
+        if not (t["type"] in (dict, list) or is_dataclass_field(prop)):
+            raise ValueError(
+                "jsonb_index requires dict, list or nested dataclass field, "
+                "got %s on %s" % (t["type"], prop.name)
+            )
+        if t["metadata"].get("array_index", None):
+            raise ValueError(
+                "jsonb_index can't be combined with array_index on %s" % prop.name
+            )
+    if t["type"] == list:
+        item_type = _array_item_type(t)
+        if t["metadata"].get("array_index", None):
+            if item_type is None:
+                raise TypeError(
+                    "Array index requires list of scalar for %s" % prop.name
+                )
+            return sqlalchemy.Column(**sqlalchemy_params(prop, typ=ARRAY(item_type)))
+        if arrays and item_type is not None and not t["metadata"].get("jsonb_index"):
+            return sqlalchemy.Column(**sqlalchemy_params(prop, typ=ARRAY(item_type)))
+    if t["type"] in (dict, list) or is_dataclass_field(prop):
+        if _use_jsonb(t["metadata"], jsonb):
+            params = sqlalchemy_params(prop, typ=JSONB())
+            return sqlalchemy.Column(**params)
     if t["type"] == date:
         params = sqlalchemy_params(prop, typ=sqlalchemy.Date())
         return sqlalchemy.Column(**params)
@@ -96,16 +216,97 @@ def dataclass_field_to_sqla_col(prop: dataclasses.Field) -> sqlalchemy.Column:
     raise KeyError(prop)
 
 
-def dc2pgsqla(schema, metadata, *, name=None) -> sqlalchemy.Table:
+def _fingerprint_value(value):
+    # repr() of arbitrary objects contains memory addresses, which would make
+    # equal schemas differ. Objects that are not plain data only contribute
+    # their type, they don't affect the table structure
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_fingerprint_value(v) for v in value]
+        if isinstance(value, (set, frozenset)):
+            items = sorted(items, key=repr)
+        return (type(value).__name__, tuple(items))
+    if isinstance(value, dict):
+        return (
+            "dict",
+            tuple(
+                sorted(
+                    ((str(k), _fingerprint_value(v)) for k, v in value.items()),
+                    key=lambda item: item[0],
+                )
+            ),
+        )
+    if isinstance(value, type) or getattr(value, "__origin__", None) is not None:
+        # classes and typing annotations, such as typing.List[str]
+        return repr(value)
+    if hasattr(value, "__code__"):
+        # functions, such as default_factory. Lambdas share their qualname
+        code = value.__code__
+        return ("function", value.__qualname__, code.co_filename, code.co_firstlineno)
+    return ("object", type(value).__module__, type(value).__qualname__)
+
+
+def _field_fingerprint(prop):
+    return (
+        prop.name,
+        _fingerprint_value(prop.type),
+        _fingerprint_value(prop.default),
+        _fingerprint_value(prop.default_factory),
+        _fingerprint_value(dict(prop.metadata)),
+    )
+
+
+def table_fingerprint(schema, *, name=None, jsonb=False, arrays=False) -> tuple:
+    """
+    Get structural fingerprint of the table produced by :func:`dc2pgsqla` for
+    ``schema``. Two ``dataclass`` with equal fingerprint produce identical tables.
+
+    :param schema: ``dataclass`` class
+    :param name: table name
+    :param jsonb: ``jsonb`` parameter of :func:`dc2pgsqla`
+    :param arrays: ``arrays`` parameter of :func:`dc2pgsqla`
+
+    :return: hashable tuple
+    """
+    return (
+        name,
+        jsonb,
+        arrays,
+        _fingerprint_value(getattr(schema, "__partition_by__", None)),
+        _fingerprint_value(getattr(schema, "__indexes__", None)),
+        tuple(
+            _field_fingerprint(prop)
+            for attr, prop in sorted(dataclass_fields(schema).items())
+        ),
+    )
+
+
+def dc2pgsqla(
+    schema, metadata, *, name=None, jsonb=False, arrays=False
+) -> sqlalchemy.Table:
     """
     Convert ``dataclass`` to ``sqlalchemy`` ORM model
 
     :param schema: ``dataclass`` class
     :param metadata: ``sqlalchemy.MetaData`` object
     :param name: model name
+    :param jsonb: if ``True``, use PostgreSQL ``JSONB`` for ``dict``, ``list``
+                  and nested ``dataclass`` fields
+    :param arrays: if ``True``, use PostgreSQL ``ARRAY`` for lists of scalar, such
+                   as ``typing.List[str]`` and ``typing.List[int]``
 
     :return: ``sqlalchemy`` ORM class
 
+    Tables are cached per ``dataclass`` in ``metadata.info``. Calling
+    ``dc2pgsqla`` again with the same ``dataclass``, ``metadata`` and name
+    returns the same table. A table with the same name produced from a
+    structurally equal ``dataclass`` (see :func:`table_fingerprint`) is also
+    reused. Such shared table does not record its ``dataclass``, so
+    :func:`table_mapper` and :func:`copy_encoder_for` require ``schema`` for
+    it. A table with the same name and different structure raises
+    ``ValueError``.
+
     **Field metadata handling**
 
     - ``primary_key: bool`` - primary key flag
@@ -113,9 +314,36 @@ def dc2pgsqla(schema, metadata, *, name=None) -> sqlalchemy.Table:
     - ``autoincrement: bool`` - flag on whether to make column autoincrement
     - ``unique: bool`` - flag on whether to make column unique
     - ``searchable: bool`` - flag on whether to make column searchable using PGSQL Trigram
+    - ``index_using: str`` - index method of the column index, eg: ``brin`` for
+      append-only ``datetime`` columns. ``unique`` columns only support
+      ``btree``. The column index of a ``unique`` column is not unique itself,
+      as the column has a unique constraint already
+    - ``index_where: str`` - SQL predicate to make the column index a partial index
+    - ``index_include: typing.List[str]`` - columns to include in the column index
+      as covering index
+    - ``index_with: dict`` - storage parameters of the column index
+    - ``jsonb_index: typing.Union[bool, str]`` - store ``dict``, ``list`` or
+      nested ``dataclass`` field as ``JSONB``, and create GIN index on it for
+      containment (``@>``) queries. ``True`` uses ``jsonb_path_ops`` operator
+      class, a string selects the operator class, eg: ``jsonb_ops``
+    - ``array_index: bool`` - store list of scalar field as ``ARRAY``, and create
+      GIN index on it for overlap (``&&``) and containment (``@>``) queries
     - ``format: str`` - format of data: ``uuid``, ``text``, ``fulltextindex``,
       ``bigint``, ``numeric``. This forces SQLAlchemy to use specific data type
       for the format.
+
+    **Class attribute handling**
+
+    - ``__table_name__: str`` - table name
+    - ``__partition_by__: dict`` - declarative partitioning of the table, with
+      ``method`` (``range``, ``list`` or ``hash``) and ``columns``, eg:
+      ``{'method': 'range', 'columns': ['created']}``. Use :func:`time_partitions`,
+      :func:`list_partition` and :func:`default_partition` to create the
+      child partitions.
+    - ``__indexes__: typing.List[dict]`` - list of additional indexes, such as
+      composite indexes. Each item accepts ``columns`` and the parameters of
+      :func:`create_index`, eg:
+      ``{'columns': ['tenant', 'created'], 'where': 'deleted IS NULL', 'include': ['name']}``
     """
     if name is None:
         if getattr(schema, "__table_name__", None):
@@ -123,15 +351,49 @@ def dc2pgsqla(schema, metadata, *, name=None) -> sqlalchemy.Table:
         else:
             name = schema.__name__.lower()
 
+    if "inverter.tables" not in metadata.info:
+        metadata.info["inverter.tables"] = weakref.WeakKeyDictionary()
+    tables = metadata.info["inverter.tables"].setdefault(schema, {})
+    key = (name, jsonb, arrays)
+    Table = tables.get(key, None)
+    if Table is not None and metadata.tables.get(Table.key, None) is Table:
+        return Table
+
+    fingerprint = table_fingerprint(schema, name=name, jsonb=jsonb, arrays=arrays)
+    existing = metadata.tables.get(name, None)
+    if existing is not None and "inverter.fingerprint" in existing.info:
+        if existing.info["inverter.fingerprint"] != fingerprint:
+            # other tables may refer to it, it can't be replaced silently
+            raise ValueError(
+                "Table %s is already defined in metadata with different structure"
+                % name
+            )
+        if _table_schema(existing) is not schema:
+            existing.info["inverter.schema"] = None
+        tables[key] = existing
+        return existing
+
     cols = []
 
-    for attr, prop in sorted(schema.__dataclass_fields__.items(), key=lambda x: x[0]):
-        prop = dataclass_field_to_sqla_col(prop)
+    for attr, prop in sorted(dataclass_fields(schema).items(), key=lambda x: x[0]):
+        prop = dataclass_field_to_sqla_col(prop, jsonb=jsonb, arrays=arrays)
         cols.append(prop)
 
-    Table = sqlalchemy.Table(name, metadata, *cols, extend_existing=True)
+    table_kwargs = {}
+    partition_by = getattr(schema, "__partition_by__", None)
+    if partition_by:
+        table_kwargs["postgresql_partition_by"] = partition_by_clause(
+            partition_by, cols
+        )
+
+    Table = sqlalchemy.Table(
+        name, metadata, *cols, extend_existing=True, **table_kwargs
+    )
+    Table.info["inverter.schema"] = weakref.ref(schema)
+    Table.info["inverter.fingerprint"] = fingerprint
+    tables[key] = Table
 
-    for attr, prop in schema.__dataclass_fields__.items():
+    for attr, prop in dataclass_fields(schema).items():
         if prop.type in [str, typing.Optional[str]] and prop.metadata.get(
             "searchable", None
         ):
@@ -143,9 +405,1036 @@ def dc2pgsqla(schema, metadata, *, name=None) -> sqlalchemy.Table:
                 unique=False,
             )
 
+    for attr, prop in dataclass_fields(schema).items():
+        meta = prop.metadata
+        if meta.get("index", None) is True and _has_field_index(meta):
+            # uniqueness is already enforced by the column unique constraint
+            create_index(
+                Table,
+                [attr],
+                using=meta.get("index_using", None),
+                where=meta.get("index_where", None),
+                include=meta.get("index_include", None),
+                with_=meta.get("index_with", None),
+            )
+
+    for attr, prop in dataclass_fields(schema).items():
+        jsonb_index = prop.metadata.get("jsonb_index", None)
+        if jsonb_index:
+            if jsonb_index is True:
+                jsonb_index = "jsonb_path_ops"
+            create_index(
+                Table,
+                [attr],
+                name="ix_%s_%s_jsonb" % (name, attr),
+                using="gin",
+                ops={attr: jsonb_index},
+            )
+
+    for attr, prop in dataclass_fields(schema).items():
+        if prop.metadata.get("array_index", None):
+            create_index(
+                Table, [attr], name="ix_%s_%s_array" % (name, attr), using="gin"
+            )
+
+    for index in getattr(schema, "__indexes__", []):
+        index = dict(index)
+        create_index(Table, index.pop("columns"), **index)
+
     # FIXME: reject nested schema
 
     return Table
 
 
+def _table_schema(table):
+    ref = table.info.get("inverter.schema", None)
+    return ref() if ref is not None else None
+
+
+def _schema_of(table, schema):
+    if schema is not None:
+        return schema
+    schema = _table_schema(table)
+    if schema is None:
+        raise ValueError(
+            "Table %s is not produced from a single dataclass, pass schema" % table.name
+        )
+    return schema
+
+
+PARTITION_METHODS = ("range", "list", "hash")
+
+
+def partition_by_clause(partition_by: dict, columns: typing.List[sqlalchemy.Column]):
+    """
+    Get ``PARTITION BY`` clause from ``__partition_by__`` declaration
+
+    :param partition_by: dictionary with ``method`` and ``columns``
+    :param columns: list of table columns
+
+    :return: partition clause string, eg: ``RANGE (created)``
+    """
+    method = partition_by.get("method", "range").lower()
+    if method not in PARTITION_METHODS:
+        raise ValueError("Unknown partition method %s" % method)
+    part_cols = list(partition_by["columns"])
+    names = [c.name for c in columns]
+    for c in part_cols:
+        if c not in names:
+            raise ValueError("Unknown partition column %s" % c)
+    pk = [c.name for c in columns if c.primary_key]
+    missing = [c for c in part_cols if pk and c not in pk]
+    if missing:
+        # PostgreSQL requires unique constraints on partitioned
+        # tables to include all partition columns
+        raise ValueError(
+            "Partition columns %s must be part of the primary key" % missing
+        )
+    return "%s (%s)" % (method.upper(), ", ".join(part_cols))
+
+
+class CreatePartition(sqlalchemy.schema.DDLElement):
+    """
+    ``CREATE TABLE ... PARTITION OF ...`` DDL statement. Compile it against
+    the PostgreSQL dialect to get the DDL string, or execute it on a
+    connection.
+
+    :param table: partitioned ``sqlalchemy.Table``
+    :param name: partition table name
+    :param from_: lower bound values for range partition, ``None`` for ``MINVALUE``
+    :param to: upper bound values for range partition, ``None`` for ``MAXVALUE``
+    :param values: list of values for list partition
+    :param modulus: modulus for hash partition
+    :param remainder: remainder for hash partition
+    :param default: flag to create the default partition
+    :param if_not_exists: flag to add ``IF NOT EXISTS``
+    """
+
+    def __init__(
+        self,
+        table: sqlalchemy.Table,
+        name: str,
+        *,
+        from_=None,
+        to=None,
+        values=None,
+        modulus=None,
+        remainder=None,
+        default=False,
+        if_not_exists=True,
+    ):
+        self.table = table
+        self.name = name
+        self.from_ = from_
+        self.to = to
+        self.values = values
+        self.modulus = modulus
+        self.remainder = remainder
+        self.default = default
+        self.if_not_exists = if_not_exists
+
+
+def _partition_literal(value):
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    return "'%s'" % str(value).replace("'", "''")
+
+
+def _range_bound(values, unbounded):
+    if values is None:
+        return unbounded
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+    return ", ".join(_partition_literal(v) for v in values)
+
+
+@compiles(CreatePartition, "postgresql")
+def _compile_create_partition(element, compiler, **kw):
+    preparer = compiler.preparer
+    parts = ["CREATE TABLE"]
+    if element.if_not_exists:
+        parts.append("IF NOT EXISTS")
+    parts.append(preparer.quote(element.name))
+    parts.append("PARTITION OF %s" % preparer.format_table(element.table))
+    if element.default:
+        parts.append("DEFAULT")
+    elif element.values is not None:
+        parts.append(
+            "FOR VALUES IN (%s)"
+            % ", ".join(_partition_literal(v) for v in element.values)
+        )
+    elif element.modulus is not None:
+        parts.append(
+            "FOR VALUES WITH (MODULUS %d, REMAINDER %d)"
+            % (element.modulus, element.remainder)
+        )
+    else:
+        parts.append(
+            "FOR VALUES FROM (%s) TO (%s)"
+            % (
+                _range_bound(element.from_, "MINVALUE"),
+                _range_bound(element.to, "MAXVALUE"),
+            )
+        )
+    return " ".join(parts)
+
+
+def _window_start(start, interval):
+    # day 29-31 does not exist in every month, and Feb 29 in every year
+    if interval not in ("month", "year"):
+        return start
+    parts = {"day": 1}
+    if interval == "year":
+        parts["month"] = 1
+    if isinstance(start, datetime):
+        parts.update(hour=0, minute=0, second=0, microsecond=0)
+    return start.replace(**parts)
+
+
+def _next_window(start, interval):
+    if isinstance(interval, timedelta):
+        return start + interval
+    if interval == "day":
+        return start + timedelta(days=1)
+    if interval == "week":
+        return start + timedelta(weeks=1)
+    if interval == "month":
+        if start.month == 12:
+            return start.replace(year=start.year + 1, month=1)
+        return start.replace(month=start.month + 1)
+    if interval == "year":
+        return start.replace(year=start.year + 1)
+    raise ValueError("Unknown partition interval %s" % interval)
+
+
+_WINDOW_FORMATS = {
+    "day": "%Y%m%d",
+    "week": "%Y%m%d",
+    "month": "%Y%m",
+    "year": "%Y",
+}
+
+
+def time_partitions(
+    table: sqlalchemy.Table,
+    start: typing.Union[date, datetime],
+    end: typing.Union[date, datetime],
+    interval: typing.Union[str, timedelta] = "month",
+    *,
+    name_format: typing.Optional[str] = None,
+) -> typing.List[CreatePartition]:
+    """
+    Create DDL statements for time window range partitions covering
+    ``start`` until ``end``
+
+    :param table: ``sqlalchemy.Table`` partitioned by range on a ``date``
+                  or ``datetime`` column
+    :param start: start of the first window. With ``month`` and ``year``
+                  interval, it is moved back to the start of its month or year
+    :param end: end of the last window, exclusive
+    :param interval: window size, one of ``day``, ``week``, ``month``, ``year``,
+                     or a ``datetime.timedelta``
+    :param name_format: ``strftime`` format of the partition name suffix
+
+    :return: list of :class:`CreatePartition`
+
+    .. code-block:: python
+
+       from sqlalchemy.dialects import postgresql
+
+       for ddl in time_partitions(table, date(2021, 1, 1), date(2022, 1, 1)):
+           print(ddl.compile(dialect=postgresql.dialect()))
+    """
+    if name_format is None:
+        name_format = _WINDOW_FORMATS.get(interval, "%Y%m%d%H%M")
+    result = []
+    window = _window_start(start, interval)
+    while window < end:
+        next_window = _next_window(window, interval)
+        result.append(
+            CreatePartition(
+                table,
+                "%s_p%s" % (table.name, window.strftime(name_format)),
+                from_=window,
+                to=next_window,
+            )
+        )
+        window = next_window
+    return result
+
+
+def list_partition(
+    table: sqlalchemy.Table, name: str, values: typing.List[typing.Any]
+) -> CreatePartition:
+    """
+    Create DDL statement for a list partition
+
+    :param table: ``sqlalchemy.Table`` partitioned by list
+    :param name: partition suffix, the partition is named ``<table>_<name>``
+    :param values: list of partition key values
+
+    :return: :class:`CreatePartition`
+    """
+    return CreatePartition(table, "%s_%s" % (table.name, name), values=values)
+
+
+def default_partition(table: sqlalchemy.Table) -> CreatePartition:
+    """
+    Create DDL statement for the default partition, named ``<table>_default``
+
+    :param table: partitioned ``sqlalchemy.Table``
+
+    :return: :class:`CreatePartition`
+    """
+    return CreatePartition(table, "%s_default" % table.name, default=True)
+
+
+def _compile_function(name: str, source: str, namespace: dict) -> typing.Callable:
+    code = compile(source, "<inverter.dc2pgsqla %s>" % name, "exec")
+    exec(code, namespace)
+    return namespace[name]
+
+
+class TableMapper(object):
+    """
+    Compiled mapper between rows of a table produced by :func:`dc2pgsqla`
+    and its ``dataclass``.
+
+    Mapping functions are generated once for the column order, and map
+    values by position without any per-row introspection:
+
+    - :attr:`to_dict` - converts a row tuple into ``appstruct`` dictionary
+    - :attr:`to_dataclass` - converts a row tuple into ``dataclass`` instance
+    - :attr:`to_params` - converts an ``appstruct`` dictionary into insert
+      parameters dictionary. Missing values are filled from the ``dataclass``
+      field default, or ``None``, so that all rows of a batch have the same
+      keys. Autoincrement primary key is only included if it is present in
+      the ``appstruct``.
+
+    Use :func:`table_mapper` to get a cached mapper.
+    """
+
+    def __init__(
+        self,
+        table: sqlalchemy.Table,
+        schema=None,
+        columns: typing.Optional[typing.Sequence[str]] = None,
+    ):
+        """
+        :param table: ``sqlalchemy.Table`` produced by :func:`dc2pgsqla`
+        :param schema: ``dataclass`` class, defaults to the ``dataclass`` the
+                       table was produced from
+        :param columns: column names in the order they appear in the rows,
+                        defaults to the table column order
+        """
+        schema = _schema_of(table, schema)
+        if columns is None:
+            columns = [c.name for c in table.columns]
+        self.table = table
+        self.schema = schema
+        self.columns = tuple(columns)
+
+        fields = dataclass_fields(schema)
+        init_fields = [c for c in self.columns if fields[c].init]
+        noinit_fields = [c for c in self.columns if not fields[c].init]
+        positions = {c: i for i, c in enumerate(self.columns)}
+
+        namespace = {"schema": schema, "object_setattr": object.__setattr__}
+
+        self.to_dict = _compile_function(
+            "to_dict",
+            "def to_dict(row):\n    return {%s}\n"
+            % ", ".join("%r: row[%d]" % (c, positions[c]) for c in self.columns),
+            namespace,
+        )
+
+        lines = [
+            "def to_dataclass(row):",
+            "    obj = schema(%s)"
+            % ", ".join("%s=row[%d]" % (c, positions[c]) for c in init_fields),
+        ]
+        for c in noinit_fields:
+            lines.append("    object_setattr(obj, %r, row[%d])" % (c, positions[c]))
+        lines.append("    return obj")
+        self.to_dataclass = _compile_function(
+            "to_dataclass", "\n".join(lines) + "\n", namespace
+        )
+
+        lines = ["def to_params(appstruct):", "    params = {"]
+        optional = []
+        autoincrement = table.autoincrement_column
+        for c in self.columns:
+            prop = fields[c]
+            col = table.columns[c]
+            if col is autoincrement:
+                optional.append(c)
+                continue
+            if not isinstance(prop.default, dataclasses._MISSING_TYPE):
+                namespace["default_%s" % c] = prop.default
+                lines.append("        %r: appstruct.get(%r, default_%s)," % (c, c, c))
+            elif not isinstance(prop.default_factory, dataclasses._MISSING_TYPE):
+                namespace["default_factory_%s" % c] = prop.default_factory
+                lines.append(
+                    "        %r: appstruct[%r] if %r in appstruct"
+                    " else default_factory_%s()," % (c, c, c, c)
+                )
+            else:
+                lines.append("        %r: appstruct.get(%r, None)," % (c, c))
+        lines.append("    }")
+        for c in optional:
+            lines.append("    if %r in appstruct:" % c)
+            lines.append("        params[%r] = appstruct[%r]" % (c, c))
+        lines.append("    return params")
+        self.to_params = _compile_function(
+            "to_params", "\n".join(lines) + "\n", namespace
+        )
+
+
+def table_mapper(
+    table: sqlalchemy.Table,
+    schema=None,
+    columns: typing.Optional[typing.Sequence[str]] = None,
+) -> TableMapper:
+    """
+    Get a cached :class:`TableMapper` for ``table``. Mappers are cached in
+    ``table.info``, keyed by ``dataclass`` and column order.
+
+    :param table: ``sqlalchemy.Table`` produced by :func:`dc2pgsqla`
+    :param schema: ``dataclass`` class, defaults to the ``dataclass`` the
+                   table was produced from
+    :param columns: column names in the order they appear in the rows,
+                    defaults to the table column order
+
+    :return: :class:`TableMapper`
+    """
+    schema = _schema_of(table, schema)
+    if columns is None:
+        columns = [c.name for c in table.columns]
+    key = (schema, tuple(columns))
+    mappers = table.info.setdefault("inverter.mappers", {})
+    if key not in mappers:
+        mappers[key] = TableMapper(table, schema=schema, columns=columns)
+    return mappers[key]
+
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+_COPY_NULL = "\\N"
+
+
+def _copy_float(value) -> str:
+    value = float(value)
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == float("-inf"):
+        return "-Infinity"
+    return repr(value)
+
+
+def _copy_bool(value) -> str:
+    return "t" if value else "f"
+
+
+def _copy_isoformat(value) -> str:
+    if isinstance(value, str):
+        return value
+    return value.isoformat()
+
+
+def _copy_json(value) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _array_element(value: str) -> str:
+    if (
+        value == ""
+        or value.upper() == "NULL"
+        or any(c in value for c in '{}",\\ \t\n\r')
+    ):
+        return '"%s"' % value.replace("\\", "\\\\").replace('"', '\\"')
+    return value
+
+
+def _copy_type_encoder(typ) -> typing.Callable[[typing.Any], str]:
+    """
+    Get function that encodes a non-null value of column type ``typ`` to
+    PostgreSQL text representation, without ``COPY`` escaping
+    """
+    if isinstance(typ, ARRAY):
+        item_encoder = _copy_type_encoder(typ.item_type)
+
+        def encode_array(value):
+            return "{%s}" % ",".join(
+                "NULL" if v is None else _array_element(item_encoder(v)) for v in value
+            )
+
+        return encode_array
+    if isinstance(typ, (sqlalchemy.JSON, sajson.JSONField)):
+        return _copy_json
+    if isinstance(typ, sqlalchemy.Boolean):
+        return _copy_bool
+    if isinstance(typ, sqlalchemy.Float):
+        return _copy_float
+    if isinstance(typ, (sqlalchemy.Date, sqlalchemy.DateTime)):
+        return _copy_isoformat
+    return str
+
+
+#: column types which text representation of non-``str`` values never
+#: contains characters that have to be escaped in ``COPY`` text format
+_COPY_SAFE_TYPES = (
+    sqlalchemy.Integer,
+    sqlalchemy.Numeric,
+    sqlalchemy.Boolean,
+    sqlalchemy.Date,
+    sqlalchemy.DateTime,
+    sautils.UUIDType,
+)
+
+
+def copy_encoder(typ) -> typing.Callable[[typing.Any], str]:
+    """
+    Get function that encodes a non-null value of column type ``typ`` to
+    PostgreSQL ``COPY`` text format field
+
+    :param typ: ``sqlalchemy`` column type
+
+    :return: callable that accepts a value and returns ``str``
+    """
+    encoder = _copy_type_encoder(typ)
+    if isinstance(typ, _COPY_SAFE_TYPES):
+
+        def encode_safe(value):
+            if isinstance(value, str):
+                # passed through as is, escape it
+                return encoder(value).translate(_COPY_ESCAPES)
+            return encoder(value)
+
+        return encode_safe
+    if encoder is str:
+        return lambda value: str(value).translate(_COPY_ESCAPES)
+    return lambda value: encoder(value).translate(_COPY_ESCAPES)
+
+
+class CopyEncoder(object):
+    """
+    Compiled encoder of ``appstruct`` dictionaries into PostgreSQL ``COPY``
+    text format, for tables produced by :func:`dc2pgsqla`.
+
+    Values are encoded according to the column type:
+
+    - ``Date`` and ``DateTime`` are encoded in ISO 8601 format, timezone
+      aware ``datetime`` keeps its UTC offset. ``str`` values are passed as is.
+    - ``Float`` is encoded using its shortest exact representation, including
+      ``NaN`` and ``Infinity``
+    - ``Numeric``, ``Integer`` and ``UUIDType`` are encoded using ``str()``
+    - ``JSON`` and ``JSONB`` are encoded as compact JSON
+    - ``ARRAY`` is encoded as PostgreSQL array literal
+    - ``None`` is encoded as ``\\N``
+
+    Backslash, newline, carriage return and tab are escaped as required by
+    ``COPY``. Missing values are filled from the ``dataclass`` field default.
+
+    Use :func:`copy_encoder_for` to get a cached encoder.
+    """
+
+    def __init__(
+        self,
+        table: sqlalchemy.Table,
+        schema=None,
+        columns: typing.Optional[typing.Sequence[str]] = None,
+    ):
+        """
+        :param table: ``sqlalchemy.Table`` produced by :func:`dc2pgsqla`
+        :param schema: ``dataclass`` class, defaults to the ``dataclass`` the
+                       table was produced from
+        :param columns: column names to load, defaults to all table columns
+                        except autoincrement primary key
+        """
+        schema = _schema_of(table, schema)
+        if columns is None:
+            autoincrement = table.autoincrement_column
+            columns = [c.name for c in table.columns if c is not autoincrement]
+        self.table = table
+        self.schema = schema
+        self.columns = tuple(columns)
+
+        mapper = table_mapper(table, schema=schema)
+        namespace = {"to_params": mapper.to_params, "NULL": _COPY_NULL}
+        lines = ["def encode(appstruct):", "    params = to_params(appstruct)"]
+        values = []
+        for idx, c in enumerate(self.columns):
+            namespace["encode_%d" % idx] = copy_encoder(table.columns[c].type)
+            lines.append("    v%d = params.get(%r)" % (idx, c))
+            values.append("NULL if v%d is None else encode_%d(v%d)" % (idx, idx, idx))
+        lines.append("    return '\\t'.join((%s,)) + '\\n'" % ", ".join(values))
+        self.encode = _compile_function("encode", "\n".join(lines) + "\n", namespace)
+
+    def statement(self) -> str:
+        """
+        Get ``COPY ... FROM STDIN`` statement for the encoded columns
+        """
+        preparer = postgresql.dialect().identifier_preparer
+        return "COPY %s (%s) FROM STDIN" % (
+            preparer.format_table(self.table),
+            ", ".join(preparer.quote(c) for c in self.columns),
+        )
+
+    def iter_chunks(
+        self,
+        appstructs: typing.Iterable[dict],
+        *,
+        chunk_size: int = 65536,
+        encoding: typing.Optional[str] = "utf-8",
+    ) -> typing.Iterator[typing.Union[bytes, str]]:
+        """
+        Encode ``appstructs`` into chunks of at least ``chunk_size``
+        characters, except the last chunk.
+
+        :param appstructs: iterable of ``appstruct`` dictionaries
+        :param chunk_size: minimum chunk size
+        :param encoding: encoding of the chunks, ``None`` to yield ``str``
+
+        :return: iterator of ``bytes``, or ``str`` if ``encoding`` is ``None``
+        """
+        encode = self.encode
+        lines = []
+        size = 0
+        for appstruct in appstructs:
+            line = encode(appstruct)
+            lines.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                chunk = "".join(lines)
+                yield chunk.encode(encoding) if encoding else chunk
+                lines = []
+                size = 0
+        if lines:
+            chunk = "".join(lines)
+            yield chunk.encode(encoding) if encoding else chunk
+
+    def write(
+        self,
+        appstructs: typing.Iterable[dict],
+        fileobj,
+        *,
+        chunk_size: int = 65536,
+        encoding: typing.Optional[str] = "utf-8",
+    ) -> None:
+        """
+        Write ``appstructs`` to ``fileobj`` in ``COPY`` text format
+
+        :param appstructs: iterable of ``appstruct`` dictionaries
+        :param fileobj: writable file-like object
+        :param chunk_size: minimum size of each write
+        :param encoding: encoding of the output, ``None`` for text file objects
+        """
+        for chunk in self.iter_chunks(
+            appstructs, chunk_size=chunk_size, encoding=encoding
+        ):
+            fileobj.write(chunk)
+
+
+def copy_encoder_for(
+    table: sqlalchemy.Table,
+    schema=None,
+    columns: typing.Optional[typing.Sequence[str]] = None,
+) -> CopyEncoder:
+    """
+    Get a cached :class:`CopyEncoder` for ``table``. Encoders are cached in
+    ``table.info``, keyed by ``dataclass`` and columns.
+
+    :param table: ``sqlalchemy.Table`` produced by :func:`dc2pgsqla`
+    :param schema: ``dataclass`` class, defaults to the ``dataclass`` the
+                   table was produced from
+    :param columns: column names to load, defaults to all table columns
+                    except autoincrement primary key
+
+    :return: :class:`CopyEncoder`
+
+    .. code-block:: python
+
+       encoder = copy_encoder_for(table)
+       with open('data.copy', 'wb') as f:
+           encoder.write(appstructs, f)
+
+       # with psycopg2
+       cursor.copy_expert(encoder.statement(), open('data.copy', 'rb'))
+    """
+    schema = _schema_of(table, schema)
+    key = (schema, tuple(columns) if columns is not None else None)
+    encoders = table.info.setdefault("inverter.copy_encoders", {})
+    if key not in encoders:
+        encoders[key] = CopyEncoder(table, schema=schema, columns=columns)
+    return encoders[key]
+
+
+#: maximum number of bind parameters per statement, the lowest limit among
+#: common PostgreSQL drivers
+MAX_BIND_PARAMS = 32767
+
+
+def _conflict_targets(table):
+    targets = []
+    primary_key = tuple(c.name for c in table.primary_key.columns)
+    if primary_key:
+        targets.append(primary_key)
+    uniques = set()
+    for constraint in table.constraints:
+        if isinstance(constraint, sqlalchemy.UniqueConstraint):
+            uniques.add(tuple(c.name for c in constraint.columns))
+    for index in table.indexes:
+        if (
+            index.unique
+            and index.dialect_options["postgresql"]["where"] is None
+            and all(isinstance(e, sqlalchemy.Column) for e in index.expressions)
+        ):
+            uniques.add(tuple(e.name for e in index.expressions))
+    positions = {c.name: i for i, c in enumerate(table.columns)}
+    for target in sorted(uniques, key=lambda t: [positions[c] for c in t]):
+        if target and target not in targets:
+            targets.append(target)
+    return targets
+
+
+def _upsert_columns(table, conflict, update):
+    targets = _conflict_targets(table)
+    if conflict is not None:
+        conflict = (tuple(conflict),)
+    elif targets:
+        conflict = tuple(targets)
+    else:
+        raise ValueError("Unable to get conflict target for %s" % table.name)
+    if update is None:
+        keys = {c for target in targets + list(conflict) for c in target}
+        update = [c.name for c in table.columns if c.name not in keys]
+    return conflict, tuple(update)
+
+
+def _on_conflict(stmt, conflict, update):
+    if update:
+        return stmt.on_conflict_do_update(
+            index_elements=list(conflict),
+            set_={c: stmt.excluded[c] for c in update},
+        )
+    return stmt.on_conflict_do_nothing(index_elements=list(conflict))
+
+
+def upsert_statement(
+    table: sqlalchemy.Table,
+    *,
+    conflict: typing.Optional[typing.Sequence[str]] = None,
+    update: typing.Optional[typing.Sequence[str]] = None,
+):
+    """
+    Get a cached single row ``INSERT ... ON CONFLICT (...) DO UPDATE``
+    statement for ``table``, to be executed with a list of parameter
+    dictionaries.
+
+    The conflict target defaults to the primary key, or to the first unique
+    column (or unique constraint) if the primary key is an autoincrement
+    column. By default, all columns except primary key and unique columns are
+    updated from the ``EXCLUDED`` row. If there is no column to update,
+    ``DO NOTHING`` is used.
+
+    :param table: ``sqlalchemy.Table`` produced by :func:`dc2pgsqla`
+    :param conflict: list of column names of the conflict target
+    :param update: list of column names to update on conflict
+
+    :return: ``sqlalchemy.dialects.postgresql.Insert`` statement
+    """
+    targets, update = _upsert_columns(table, conflict, update)
+    conflict = targets[0]
+    autoincrement = table.autoincrement_column
+    if len(targets) > 1 and autoincrement is not None:
+        if autoincrement.name in conflict:
+            conflict = targets[1]
+    key = (conflict, update)
+    statements = table.info.setdefault("inverter.upserts", {})
+    if key not in statements:
+        statements[key] = _on_conflict(postgresql.insert(table), conflict, update)
+    return statements[key]
+
+
+def upsert(
+    connection,
+    table: sqlalchemy.Table,
+    appstructs: typing.Iterable[dict],
+    *,
+    schema=None,
+    conflict: typing.Optional[typing.Sequence[str]] = None,
+    update: typing.Optional[typing.Sequence[str]] = None,
+    chunk_size: typing.Optional[int] = None,
+) -> int:
+    """
+    Insert or update ``appstructs`` in batches of multi row
+    ``INSERT ... VALUES (...), (...) ON CONFLICT (...) DO UPDATE`` statements.
+    ``appstructs`` are converted to parameters using :func:`table_mapper`.
+
+    Updated columns default as in :func:`upsert_statement`. The conflict
+    target of each row defaults to the primary key, or to the first unique
+    column (or unique constraint) whose values are all present in the row,
+    such as when the primary key is an autoincrement column. On conflict,
+    only the columns present in the ``appstruct`` are updated, so that missing
+    keys don't overwrite existing values with defaults. Rows with different
+    keys or conflict targets are sent in separate statements, and writes to
+    the same primary key or unique value are executed in the order of
+    ``appstructs``. When the same conflict target value occurs more than once
+    in a batch, the last ``appstruct`` is used.
+
+    :param connection: ``sqlalchemy`` connection or session
+    :param table: ``sqlalchemy.Table`` produced by :func:`dc2pgsqla`
+    :param appstructs: iterable of ``appstruct`` dictionaries
+    :param schema: ``dataclass`` class, defaults to the ``dataclass`` the
+                   table was produced from
+    :param conflict: list of column names of the conflict target
+    :param update: list of column names to update on conflict
+    :param chunk_size: maximum number of rows per statement. Statements are
+                       always limited to :data:`MAX_BIND_PARAMS` parameters
+
+    :return: number of affected rows
+    """
+    targets, update = _upsert_columns(table, conflict, update)
+    to_params = table_mapper(table, schema=schema).to_params
+
+    def execute(batch):
+        _, columns, target = batch
+        rows = batches.pop(batch)
+        for row_key in batch_keys.pop(batch, ()):
+            if pending.get(row_key) == batch:
+                del pending[row_key]
+        stmt = _on_conflict(
+            postgresql.insert(table).values(list(rows.values())), target, columns
+        )
+        return connection.execute(stmt).rowcount
+
+    rowcount = 0
+    batches = {}
+    batch_keys = {}
+    # conflict target values of rows waiting in batches, to the batch
+    pending = {}
+    for appstruct in appstructs:
+        params = to_params(appstruct)
+        row_keys = [
+            (target, tuple(params.get(c, None) for c in target)) for target in targets
+        ]
+        row_keys = [k for k in row_keys if None not in k[1]]
+        target = row_keys[0][0] if row_keys else targets[0]
+        batch = (tuple(params), tuple(c for c in update if c in appstruct), target)
+        for row_key in row_keys:
+            if pending.get(row_key, batch) != batch:
+                rowcount += execute(pending[row_key])
+        rows = batches.setdefault(batch, {})
+        if row_keys:
+            rows[row_keys[0]] = params
+            for row_key in row_keys:
+                pending[row_key] = batch
+            batch_keys.setdefault(batch, []).extend(row_keys)
+        else:
+            # no conflict target value, such as autoincrement primary key
+            rows[object()] = params
+        limit = MAX_BIND_PARAMS // len(params)
+        if chunk_size is not None:
+            limit = min(limit, chunk_size)
+        if len(rows) >= limit:
+            rowcount += execute(batch)
+    for batch in list(batches):
+        rowcount += execute(batch)
+    return rowcount
+
+
+#: supported filter operators of :func:`compile_filter`
+FILTER_OPERATORS = (
+    "==",
+    "!=",
+    "in",
+    "not in",
+    "<",
+    "<=",
+    ">",
+    ">=",
+    "search",
+    "similar",
+    "match",
+    "contains",
+    "overlap",
+)
+
+#: operators that can be answered by each index method
+_INDEX_METHOD_OPERATORS = {
+    "btree": ("==", "in", "<", "<=", ">", ">="),
+    "hash": ("==", "in"),
+    "brin": ("==", "in", "<", "<=", ">", ">="),
+    "gin": ("contains", "overlap", "match"),
+    "gist": ("contains", "overlap", "match"),
+}
+
+_TRGM_OPS = ("gin_trgm_ops", "gist_trgm_ops")
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _filter_clause(column, op, value):
+    if op == "==":
+        return column.is_(None) if value is None else column == value
+    if op == "!=":
+        return column.isnot(None) if value is None else column != value
+    if op == "in":
+        return column.in_(value)
+    if op == "not in":
+        return column.notin_(value)
+    if op == "<":
+        return column < value
+    if op == "<=":
+        return column <= value
+    if op == ">":
+        return column > value
+    if op == ">=":
+        return column >= value
+    if op == "search":
+        return column.ilike("%%%s%%" % _like_escape(value), escape="\\")
+    if op == "similar":
+        return column.op("%")(value)
+    if op == "match":
+        return column.op("@@")(sqlalchemy.func.plainto_tsquery(value))
+    if op == "contains":
+        return column.contains(value)
+    if op == "overlap":
+        if isinstance(column.type, JSONB):
+            return column.has_any(postgresql.array(value))
+        return column.overlap(value)
+    raise ValueError("Unknown operator %s" % op)
+
+
+def compile_filter(
+    table: sqlalchemy.Table,
+    filters: typing.List[typing.Tuple[str, str, typing.Any]],
+):
+    """
+    Compile filter expressions into ``sqlalchemy`` clause for tables produced
+    by :func:`dc2pgsqla`, using predicates that can use the indexes it
+    creates. Filters are combined with ``AND``.
+
+    - ``==``, ``!=``, ``in``, ``not in``, ``<``, ``<=``, ``>``, ``>=`` are
+      compared as is, ``None`` is compared using ``IS``
+    - ``search`` is case insensitive substring search using ``ILIKE``, which
+      uses the trigram index of ``searchable`` fields
+    - ``similar`` uses trigram similarity operator ``%``
+    - ``match`` uses ``@@`` with ``plainto_tsquery`` on ``fulltextindex`` fields
+    - ``contains`` uses ``@>`` on ``ARRAY`` and ``JSONB`` fields, ``overlap``
+      uses ``&&`` on ``ARRAY`` fields and ``?|`` (has any key) on ``JSONB``
+      fields, which use their GIN index
+
+    Use :func:`explain_filter` to check which filters can use an index.
+
+    :param table: ``sqlalchemy.Table`` produced by :func:`dc2pgsqla`
+    :param filters: list of ``(column, operator, value)``
+
+    :return: ``sqlalchemy`` clause
+
+    .. code-block:: python
+
+       stmt = table.select().where(
+           compile_filter(table, [('name', 'search', 'john'),
+                                  ('created', '>=', datetime(2021, 1, 1))]))
+    """
+    clauses = []
+    for name, op, value in filters:
+        if op not in FILTER_OPERATORS:
+            raise ValueError("Unknown operator %s" % op)
+        clauses.append(_filter_clause(table.columns[name], op, value))
+    return sqlalchemy.and_(*clauses)
+
+
+def _column_indexes(table, column):
+    """
+    Get ``(name, method, opclass, partial)`` of indexes having ``column`` as
+    the leading column
+    """
+    result = []
+    if column.primary_key or column.unique:
+        result.append((None, "btree", None, False))
+    for index in table.indexes:
+        columns = list(index.columns)
+        if not columns or columns[0] is not column:
+            continue
+        options = index.dialect_options["postgresql"]
+        opclass = (options["ops"] or {}).get(column.name, None)
+        result.append(
+            (
+                index.name,
+                options["using"] or "btree",
+                opclass,
+                options["where"] is not None,
+            )
+        )
+    return result
+
+
+def _index_supports(method, opclass, op):
+    if op in ("search", "similar"):
+        return opclass in _TRGM_OPS
+    if opclass in _TRGM_OPS:
+        return False
+    if op == "overlap" and opclass == "jsonb_path_ops":
+        return False
+    return op in _INDEX_METHOD_OPERATORS.get(method, ())
+
+
+def explain_filter(
+    table: sqlalchemy.Table,
+    filters: typing.List[typing.Tuple[str, str, typing.Any]],
+) -> typing.List[dict]:
+    """
+    Check which filters of :func:`compile_filter` can use an index of
+    ``table``. This is a static check against the indexes declared on the
+    ``sqlalchemy.Table``, it does not query the database planner.
+
+    :param table: ``sqlalchemy.Table`` produced by :func:`dc2pgsqla`
+    :param filters: list of ``(column, operator, value)``
+
+    :return: list of dictionary for each filter, with ``column``, ``operator``,
+             ``index`` (index name, ``None`` for primary key and unique
+             constraint), ``indexed`` flag, and ``reason`` when the filter
+             can't use an index, or only a partial index
+    """
+    result = []
+    for name, op, value in filters:
+        if op not in FILTER_OPERATORS:
+            raise ValueError("Unknown operator %s" % op)
+        column = table.columns[name]
+        item = {"column": name, "operator": op, "index": None, "indexed": False}
+        candidates = [
+            (index_name, partial)
+            for index_name, method, opclass, partial in _column_indexes(table, column)
+            if _index_supports(method, opclass, op)
+        ]
+        # prefer full index over partial index
+        candidates.sort(key=lambda c: c[1])
+        if op in ("!=", "not in"):
+            item["reason"] = "negated filter can't use index"
+        elif not candidates:
+            item["reason"] = "no index on %s supporting %s" % (name, op)
+        else:
+            index_name, partial = candidates[0]
+            item["index"] = index_name
+            item["indexed"] = True
+            if partial:
+                item["reason"] = (
+                    "partial index, only used if the query implies its predicate"
+                )
+        result.append(item)
+    return result
+
+
 convert = dc2pgsqla
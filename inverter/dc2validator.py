@@ -0,0 +1,267 @@
+import re
+import typing
+import weakref
+
+from .dc2jsonschema import dc2jsonschema
+
+_TYPE_CHECKS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "integer": "(isinstance({v}, int) and not isinstance({v}, bool))",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+}
+
+_NULL = {"type": "null"}
+
+_cache = weakref.WeakKeyDictionary()
+
+
+def _pointer_token(key):
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+class _Compiler(object):
+    """
+    Generates Python source of validation functions from JSON Schema. Each
+    generated function has ``(value, path, errors)`` signature, and appends
+    ``(json pointer, message)`` tuples to ``errors``.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.namespace = {"re": re}
+        self.functions = []
+        self.refs = {}
+        self.counter = 0
+
+    def name(self, prefix):
+        self.counter += 1
+        return "%s_%d" % (prefix, self.counter)
+
+    def constant(self, value, prefix="c"):
+        name = self.name(prefix)
+        self.namespace[name] = value
+        return name
+
+    def resolve(self, ref):
+        if not ref.startswith("#/"):
+            raise ValueError("Only local $ref is supported, got %s" % ref)
+        node = self.root
+        for token in ref[2:].split("/"):
+            node = node[token.replace("~1", "/").replace("~0", "~")]
+        return node
+
+    def function(self, node):
+        """
+        Compile ``node`` into a function and get its name
+        """
+        if "$ref" in node:
+            ref = node["$ref"]
+            if ref not in self.refs:
+                # registered before compiling, so that recursion resolves to it
+                self.refs[ref] = self.name("v")
+                self._function(self.refs[ref], self.resolve(ref))
+            return self.refs[ref]
+        name = self.name("v")
+        self._function(name, node)
+        return name
+
+    def _function(self, name, node):
+        lines = ["def %s(value, path, errors):" % name]
+        self.check(node, "value", "path", lines, 1)
+        lines.append("    return errors")
+        self.functions.append("\n".join(lines))
+
+    def check(self, node, var, path, lines, depth):
+        """
+        Emit statements validating ``var`` against ``node``
+        """
+        pad = "    " * depth
+        if "$ref" in node:
+            lines.append("%s%s(%s, %s, errors)" % (pad, self.function(node), var, path))
+            return
+
+        for key in ("anyOf", "oneOf"):
+            options = node.get(key, None)
+            if not options:
+                continue
+            if len(options) == 2 and options[1] == _NULL:
+                # nullable field, as generated by dc2jsl
+                lines.append("%sif %s is not None:" % (pad, var))
+                self.check(options[0], var, path, lines, depth + 1)
+                continue
+            funcs = ", ".join(self.function(option) for option in options)
+            lines.append(
+                "%s_matched = sum(not f(%s, %s, []) for f in (%s,))"
+                % (pad, var, path, funcs)
+            )
+            if key == "anyOf":
+                lines.append("%sif not _matched:" % pad)
+                message = "is not valid under any of the given schemas"
+            else:
+                lines.append("%sif _matched != 1:" % pad)
+                message = "is not valid under exactly one of the given schemas"
+            lines.append("%s    errors.append((%s, %r))" % (pad, path, message))
+
+        types = node.get("type", None)
+        if types is not None:
+            if isinstance(types, str):
+                types = [types]
+            cond = " or ".join(_TYPE_CHECKS[t].format(v=var) for t in types)
+            message = "is not of type %s" % ", ".join(repr(t) for t in types)
+            lines.append("%sif not (%s):" % (pad, cond))
+            lines.append("%s    errors.append((%s, %r))" % (pad, path, message))
+            lines.append("%selse:" % pad)
+            pad = pad + "    "
+            depth += 1
+        body_start = len(lines)
+
+        if "pattern" in node:
+            regex = self.constant(re.compile(node["pattern"]), "pattern")
+            lines.append(
+                "%sif isinstance(%s, str) and not %s.search(%s):"
+                % (pad, var, regex, var)
+            )
+            lines.append(
+                "%s    errors.append((%s, %r))"
+                % (pad, path, "does not match %r" % node["pattern"])
+            )
+
+        if "items" in node and isinstance(node["items"], dict):
+            item = "item_%d" % depth
+            idx = "idx_%d" % depth
+            lines.append("%sif isinstance(%s, list):" % (pad, var))
+            lines.append("%s    for %s, %s in enumerate(%s):" % (pad, idx, item, var))
+            self.check(
+                node["items"],
+                item,
+                "%s + '/' + str(%s)" % (path, idx),
+                lines,
+                depth + 2,
+            )
+
+        if any(k in node for k in ("properties", "required", "additionalProperties")):
+            lines.append("%sif isinstance(%s, dict):" % (pad, var))
+            self.object_checks(node, var, path, lines, depth + 1)
+
+        if len(lines) == body_start and types is not None:
+            lines.append("%spass" % pad)
+
+    def object_checks(self, node, var, path, lines, depth):
+        pad = "    " * depth
+        properties = node.get("properties", {})
+        for key in node.get("required", []):
+            lines.append("%sif %r not in %s:" % (pad, key, var))
+            lines.append(
+                "%s    errors.append((%s, %r))"
+                % (pad, path, "%r is a required property" % key)
+            )
+        if node.get("additionalProperties", True) is False:
+            allowed = self.constant(frozenset(properties), "allowed")
+            lines.append("%sfor key in %s:" % (pad, var))
+            lines.append("%s    if key not in %s:" % (pad, allowed))
+            lines.append(
+                "%s        errors.append((%s, 'additional property %%r is not allowed' %% key))"
+                % (pad, path)
+            )
+        for key, subnode in properties.items():
+            prop_var = "p_%d" % depth
+            lines.append("%s%s = %s.get(%r, MISSING)" % (pad, prop_var, var, key))
+            lines.append("%sif %s is not MISSING:" % (pad, prop_var))
+            start = len(lines)
+            self.check(
+                subnode,
+                prop_var,
+                "%s + %r" % (path, "/" + _pointer_token(key)),
+                lines,
+                depth + 1,
+            )
+            if len(lines) == start:
+                lines.append("%s    pass" % pad)
+
+    def compile(self):
+        entry = self.function(self.root)
+        self.namespace["MISSING"] = object()
+        source = "\n\n".join(self.functions) + "\n"
+        code = compile(source, "<inverter.dc2validator>", "exec")
+        exec(code, self.namespace)
+        return self.namespace[entry], source
+
+
+def compile_validator(
+    jsonschema: dict,
+) -> typing.Callable[[typing.Any], typing.List[typing.Tuple[str, str]]]:
+    """
+    Compile JSON Schema produced by ``inverter.dc2jsl`` or
+    ``inverter.dc2jsonschema`` into a specialized Python validation function.
+
+    Supported keywords are ``type``, ``properties``, ``required``,
+    ``additionalProperties``, ``pattern``, ``items``, ``anyOf``, ``oneOf`` and
+    local ``$ref``, which is enough for the schemas generated by ``inverter``.
+    ``format`` is not validated.
+
+    :param jsonschema: JSON Schema dictionary
+
+    :return: function that accepts decoded JSON data and returns list of
+             ``(json pointer, message)`` errors, empty if the data is valid
+    """
+    validate, source = _Compiler(jsonschema).compile()
+
+    def validator(instance):
+        return validate(instance, "", [])
+
+    validator.source = source
+    return validator
+
+
+def dc2validator(
+    schema,
+    *,
+    ignore_required=False,
+    additional_properties=False,
+    mode="default",
+    definitions=False,
+) -> typing.Callable[[typing.Any], typing.List[typing.Tuple[str, str]]]:
+    """
+    Get compiled validation function of the JSON Schema produced by
+    ``inverter.dc2jsonschema`` for ``dataclass``. Validators are compiled once
+    per ``dataclass`` and parameters, and cached.
+
+    Accepts the same parameters as ``inverter.dc2jsl.convert``.
+
+    :param schema: ``dataclass`` class
+    :param ignore_required: if ``True``, set all fields as nullable
+    :param additional_properties: Allow ``additional_properties`` in JSON Schema
+    :param mode: mode flag
+    :param definitions: if ``True``, compile one validation function per
+                        nested ``dataclass``, shared by all fields using it
+
+    :return: function that accepts decoded JSON data and returns list of
+             ``(json pointer, message)`` errors, empty if the data is valid
+
+    .. code-block:: python
+
+       validate = dc2validator(MyData)
+       errors = validate(json.loads(body))
+       if errors:
+           raise HTTPBadRequest(dict(errors))
+    """
+    key = (ignore_required, additional_properties, mode, definitions)
+    cache = _cache.setdefault(schema, {})
+    if key not in cache:
+        cache[key] = compile_validator(
+            dc2jsonschema(
+                schema,
+                ignore_required=ignore_required,
+                additional_properties=additional_properties,
+                mode=mode,
+                definitions=definitions,
+            )
+        )
+    return cache[key]
+
+
+convert = dc2validator
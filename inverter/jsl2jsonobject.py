@@ -1,50 +1,78 @@
+import weakref
+
 import jsonobject
 import jsl
 
+_cache = weakref.WeakKeyDictionary()
+
+
+def _item_type(schema):
+    # a document that is still being converted refers to itself, defer the
+    # lookup to jsonobject. weakref, so that the cached class does not keep
+    # its source document alive
+    if schema in _cache and _cache[schema] is None:
+        ref = weakref.ref(schema)
+        return lambda: _cache[ref()]
+    return jsl2jsonobject(schema)
 
-def jsl_field_to_jsonobject_property(prop: jsl.BaseField) -> jsonobject.JsonProperty:
+
+def jsl_field_to_jsonobject_property(
+    prop: jsl.BaseField, name=None
+) -> jsonobject.JsonProperty:
+    if name is None:
+        name = prop.name
     if isinstance(prop, jsl.DateTimeField):
-        return jsonobject.DateTimeProperty(name=prop.name, required=prop.required)
+        return jsonobject.DateTimeProperty(name=name, required=prop.required)
     if isinstance(prop, jsl.StringField):
-        return jsonobject.StringProperty(name=prop.name, required=prop.required)
+        return jsonobject.StringProperty(name=name, required=prop.required)
     if isinstance(prop, jsl.IntField):
-        return jsonobject.IntegerProperty(name=prop.name, required=prop.required)
+        return jsonobject.IntegerProperty(name=name, required=prop.required)
     if isinstance(prop, jsl.DictField):
-        return jsonobject.DictProperty(name=prop.name, required=prop.required)
+        return jsonobject.DictProperty(name=name, required=prop.required)
     if isinstance(prop, jsl.NumberField):
-        return jsonobject.FloatProperty(name=prop.name, required=prop.required)
+        return jsonobject.FloatProperty(name=name, required=prop.required)
     if isinstance(prop, jsl.BooleanField):
-        return jsonobject.BooleanProperty(name=prop.name, required=prop.required)
+        return jsonobject.BooleanProperty(name=name, required=prop.required)
     if isinstance(prop, jsl.DocumentField):
         if prop.document_cls:
-            subtype = jsl2jsonobject(prop.document_cls)
+            subtype = _item_type(prop.document_cls)
             return jsonobject.DictProperty(
-                name=prop.name, item_type=subtype, required=prop.required
+                name=name, item_type=subtype, required=prop.required
             )
-        return jsonobject.DictProperty(name=prop.name, required=prop.required)
+        return jsonobject.DictProperty(name=name, required=prop.required)
     if isinstance(prop, jsl.ArrayField):
         if prop.items:
             if isinstance(prop.items, jsl.DocumentField):
-                subtype = jsl2jsonobject(prop.items.document_cls)
+                subtype = _item_type(prop.items.document_cls)
             elif isinstance(prop.items, jsl.BaseField):
                 subtype = jsl_field_to_jsonobject_property(prop.items)
             else:
                 raise KeyError(prop.items)
             return jsonobject.ListProperty(item_type=subtype, required=prop.required)
-        return jsonobject.ListProperty(name=prop.name, required=prop.required)
+        return jsonobject.ListProperty(name=name, required=prop.required)
 
     raise KeyError(prop)
 
 
 def jsl2jsonobject(schema):
     # output jsonobject schema from jsl schema
+    # converted once per jsl document, and cached
+    if _cache.get(schema, None) is not None:
+        return _cache[schema]
+    _cache[schema] = None
+
     attrs = {}
-    for attr, prop in schema._fields.items():
-        prop.name = attr
-        attrs[attr] = jsl_field_to_jsonobject_property(prop)
+    try:
+        for attr, prop in schema._fields.items():
+            attrs[attr] = jsl_field_to_jsonobject_property(prop, name=attr)
+    except Exception:
+        del _cache[schema]
+        raise
 
     Schema = type("Schema", (jsonobject.JsonObject,), attrs)
+    _cache[schema] = Schema
 
     return Schema
 
+
 convert = jsl2jsonobject
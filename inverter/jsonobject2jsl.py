@@ -1,6 +1,10 @@
+import weakref
+
 import jsonobject
 import jsl
 
+_cache = weakref.WeakKeyDictionary()
+
 
 def _set_nullable(prop):
     if not prop.required:
@@ -8,15 +12,74 @@ def _set_nullable(prop):
     return prop
 
 
-def jsonobject2jsl(schema, nullable=False):
+def _definition_id(schema, nullable):
+    definition_id = "%s.%s" % (schema.__module__, schema.__qualname__)
+    if nullable:
+        # nullable and non nullable variant may both be used in one schema
+        definition_id += ".nullable"
+    return definition_id
+
+
+class DeferredDocumentField(jsl.DocumentField):
+    """
+    ``jsl.DocumentField`` that looks up its document class from the conversion
+    cache on access. This allows referencing a ``JsonObject`` that is still
+    being converted, such as on self referencing ``JsonObject``.
+
+    :meta private:
+    """
+
+    def __init__(self, schema, key, **kwargs):
+        # weakref, so that the cached document does not keep its source alive
+        self.schema_ref = weakref.ref(schema)
+        self.key = key
+        super().__init__(document_cls=None, **kwargs)
+
+    @property
+    def document_cls(self):
+        return _cache[self.schema_ref()][self.key]
+
+
+def _document_field(schema, nullable, definitions, **kwargs):
+    key = (nullable, definitions)
+    if key in _cache.get(schema, {}) and _cache[schema][key] is None:
+        return DeferredDocumentField(schema, key, as_ref=definitions, **kwargs)
+    return jsl.DocumentField(
+        document_cls=jsonobject2jsl(schema, nullable=nullable, definitions=definitions),
+        as_ref=definitions,
+        **kwargs
+    )
+
+
+def jsonobject2jsl(schema, nullable=False, definitions=False):
     # output jsl schema from jsonobject schema
+    # with definitions=True, nested JsonObject are emitted once in
+    # `definitions` and referred with `$ref`
+    # converted once per JsonObject and parameters, and cached
+    documents = _cache.setdefault(schema, {})
+    key = (nullable, definitions)
+    if documents.get(key, None) is not None:
+        return documents[key]
+    documents[key] = None
+
     attrs = {}
 
     class Options(object):
         additional_properties = True
+        definition_id = _definition_id(schema, nullable)
 
-    for attr, prop in schema._properties_by_attr.items():
-        prop = jsonobject_property_to_jsl_field(prop, nullable=nullable)
+    try:
+        fields = {
+            attr: jsonobject_property_to_jsl_field(
+                prop, nullable=nullable, definitions=definitions
+            )
+            for attr, prop in schema._properties_by_attr.items()
+        }
+    except Exception:
+        del documents[key]
+        raise
+
+    for attr, prop in fields.items():
         if nullable:
             attrs[attr] = _set_nullable(prop)
         else:
@@ -30,12 +93,13 @@ def jsonobject2jsl(schema, nullable=False):
 
     attrs["Options"] = Options
     Schema = type("Schema", (jsl.Document,), attrs)
+    documents[key] = Schema
 
     return Schema
 
 
 def jsonobject_property_to_jsl_field(
-    prop: jsonobject.JsonProperty, nullable=False
+    prop: jsonobject.JsonProperty, nullable=False, definitions=False
 ) -> jsl.BaseField:
     if isinstance(prop, jsonobject.DateProperty):
         return jsl.DateTimeField(name=prop.name, required=prop.required)
@@ -51,22 +115,24 @@ def jsonobject_property_to_jsl_field(
         return jsl.BooleanField(name=prop.name, required=prop.required)
     if isinstance(prop, jsonobject.DictProperty):
         if prop.item_wrapper:
-            subtype = jsonobject2jsl(prop.item_wrapper.item_type, nullable=nullable)
-            return jsl.DocumentField(
-                name=prop.name, document_cls=subtype, required=prop.required
+            return _document_field(
+                prop.item_wrapper.item_type,
+                nullable,
+                definitions,
+                name=prop.name,
+                required=prop.required,
             )
         return jsl.DictField(name=prop.name, required=prop.required)
     if isinstance(prop, jsonobject.ListProperty):
         if prop.item_wrapper:
             if isinstance(prop.item_wrapper, jsonobject.ObjectProperty):
                 if issubclass(prop.item_wrapper.item_type, jsonobject.JsonObject):
-                    subtype = jsl.DocumentField(
-                        document_cls=jsonobject2jsl(prop.item_wrapper.item_type),
-                        nullable=nullable,
+                    subtype = _document_field(
+                        prop.item_wrapper.item_type, False, definitions
                     )
                 elif isinstance(prop.item_wrapper.item_type, jsonobject.JsonProperty):
                     subtype = jsonobject_property_to_jsl_field(
-                        prop.item_wrapper.item_type
+                        prop.item_wrapper.item_type, definitions=definitions
                     )
                 else:
                     raise KeyError(prop.item_wrapper.item_type)
@@ -85,4 +151,5 @@ def jsonobject_property_to_jsl_field(
 
     raise KeyError(prop)
 
+
 convert = jsonobject2jsl
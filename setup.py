@@ -30,13 +30,17 @@ setup(name='inverter',
       install_requires=[
           'colander',
           'jsl',
-          'sqlalchemy',
+          'sqlalchemy>=2.0.4',
           'sqlalchemy_utils',
           'sqlalchemy_jsonfield',
           'deform',
           'pytz',
           # -*- Extra requirements: -*-
       ],
+      extras_require={
+          'numpy': ['numpy'],
+          'arrow': ['pyarrow'],
+      },
       entry_points="""
       # -*- Entry points: -*-
       """,
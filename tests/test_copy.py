@@ -0,0 +1,80 @@
+import dataclasses
+import typing
+from datetime import date, datetime
+
+import pytest
+import sqlalchemy
+
+from inverter import dc2pgsqla
+
+
+@dataclasses.dataclass
+class Event:
+    id: str = dataclasses.field(metadata={"primary_key": True})
+    qty: int
+    name: str
+    day: date
+    created: datetime
+    score: float
+    active: bool
+    tags: typing.List[str]
+    payload: dict
+    note: typing.Optional[str] = None
+
+
+@pytest.fixture
+def encoder():
+    table = dc2pgsqla.convert(Event, sqlalchemy.MetaData(), jsonb=True, arrays=True)
+    return dc2pgsqla.copy_encoder_for(table)
+
+
+def test_copy_encode(encoder):
+    line = encoder.encode(
+        {
+            "id": "e1",
+            "qty": 1,
+            "name": "a\tb\\c\nd",
+            "day": date(2021, 1, 2),
+            "created": datetime(2021, 1, 2, 3, 4, 5),
+            "score": float("nan"),
+            "active": True,
+            "tags": ["x y", "NULL", 'q"'],
+            "payload": {"k": "v\n"},
+            "note": None,
+        }
+    )
+    fields = dict(zip(encoder.columns, line[:-1].split("\t")))
+    assert line.endswith("\n")
+    assert fields == {
+        "id": "e1",
+        "qty": "1",
+        "name": "a\\tb\\\\c\\nd",
+        "day": "2021-01-02",
+        "created": "2021-01-02T03:04:05",
+        "score": "NaN",
+        "active": "t",
+        "tags": '{"x y","NULL","q\\\\""}',
+        "payload": '{"k":"v\\\\n"}',
+        "note": "\\N",
+    }
+
+
+@pytest.mark.parametrize(
+    "column,value,expected",
+    [
+        ("day", "2021-01-02\t", "2021-01-02\\t"),
+        ("created", "2021-01-02 03:04:05\n", "2021-01-02 03:04:05\\n"),
+        ("qty", "1\\", "1\\\\"),
+    ],
+)
+def test_copy_encode_str_of_safe_type(column, value, expected):
+    table = dc2pgsqla.convert(Event, sqlalchemy.MetaData())
+    encode = dc2pgsqla.copy_encoder(table.columns[column].type)
+    assert encode(value) == expected
+
+
+def test_copy_statement(encoder):
+    assert encoder.statement() == (
+        "COPY event (active, created, day, id, name, note, payload, qty, score, "
+        "tags) FROM STDIN"
+    )
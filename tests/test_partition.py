@@ -0,0 +1,96 @@
+import dataclasses
+from datetime import date, datetime
+
+import pytest
+import sqlalchemy
+from sqlalchemy.dialects import postgresql
+
+from inverter import dc2pgsqla
+
+
+@dataclasses.dataclass
+class Measurement:
+    id: int = dataclasses.field(metadata={"primary_key": True})
+    created: datetime = dataclasses.field(metadata={"primary_key": True})
+    kind: str
+
+    __partition_by__ = {"method": "range", "columns": ["created"]}
+
+
+@pytest.fixture
+def table():
+    return dc2pgsqla.convert(Measurement, sqlalchemy.MetaData())
+
+
+def ddl(element):
+    return str(element.compile(dialect=postgresql.dialect()))
+
+
+def test_partition_by(table):
+    assert table.dialect_options["postgresql"]["partition_by"] == "RANGE (created)"
+
+
+def test_time_partitions_month(table):
+    assert [
+        ddl(p)
+        for p in dc2pgsqla.time_partitions(
+            table, datetime(2021, 1, 31, 12), datetime(2021, 3, 1)
+        )
+    ] == [
+        "CREATE TABLE IF NOT EXISTS measurement_p202101 PARTITION OF measurement "
+        "FOR VALUES FROM ('2021-01-01T00:00:00') TO ('2021-02-01T00:00:00')",
+        "CREATE TABLE IF NOT EXISTS measurement_p202102 PARTITION OF measurement "
+        "FOR VALUES FROM ('2021-02-01T00:00:00') TO ('2021-03-01T00:00:00')",
+    ]
+
+
+def test_time_partitions_year(table):
+    assert [
+        ddl(p)
+        for p in dc2pgsqla.time_partitions(
+            table, date(2020, 2, 29), date(2022, 1, 1), "year"
+        )
+    ] == [
+        "CREATE TABLE IF NOT EXISTS measurement_p2020 PARTITION OF measurement "
+        "FOR VALUES FROM ('2020-01-01') TO ('2021-01-01')",
+        "CREATE TABLE IF NOT EXISTS measurement_p2021 PARTITION OF measurement "
+        "FOR VALUES FROM ('2021-01-01') TO ('2022-01-01')",
+    ]
+
+
+def test_list_and_default_partition(table):
+    assert ddl(dc2pgsqla.list_partition(table, "ab", ["a", "b'"])) == (
+        "CREATE TABLE IF NOT EXISTS measurement_ab PARTITION OF measurement "
+        "FOR VALUES IN ('a', 'b''')"
+    )
+    assert ddl(dc2pgsqla.default_partition(table)) == (
+        "CREATE TABLE IF NOT EXISTS measurement_default PARTITION OF measurement "
+        "DEFAULT"
+    )
+
+
+def test_range_and_hash_partition_bounds(table):
+    assert ddl(dc2pgsqla.CreatePartition(table, "p_old", to=date(2020, 1, 1))) == (
+        "CREATE TABLE IF NOT EXISTS p_old PARTITION OF measurement "
+        "FOR VALUES FROM (MINVALUE) TO ('2020-01-01')"
+    )
+    assert ddl(
+        dc2pgsqla.CreatePartition(
+            table, "p_0", modulus=4, remainder=0, if_not_exists=False
+        )
+    ) == (
+        "CREATE TABLE p_0 PARTITION OF measurement "
+        "FOR VALUES WITH (MODULUS 4, REMAINDER 0)"
+    )
+
+
+def test_partition_column_not_in_primary_key():
+    @dataclasses.dataclass
+    class Bad:
+        id: int = dataclasses.field(metadata={"primary_key": True})
+        created: datetime
+
+        __partition_by__ = {"method": "range", "columns": ["created"]}
+
+    with pytest.raises(ValueError):
+        dc2pgsqla.convert(Bad, sqlalchemy.MetaData())
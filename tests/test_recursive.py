@@ -0,0 +1,110 @@
+import dataclasses
+import gc
+import json
+import typing
+import weakref
+
+import deform
+import pytest
+
+from inverter import dc2colander, dc2colanderavro, dc2colanderESjson, dc2colanderjson
+from inverter.common import dataclass_fields
+
+
+@dataclasses.dataclass
+class Node:
+    name: str
+    child: typing.Optional["Node"] = None
+    children: typing.List["Node"] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class LinkedNode:
+    name: str
+    next: typing.Optional["LinkedNode"] = None
+
+
+@pytest.mark.parametrize(
+    "converter", [dc2colander, dc2colanderjson, dc2colanderESjson, dc2colanderavro]
+)
+@pytest.mark.parametrize(
+    "appstruct",
+    [
+        {"name": "a", "child": None, "children": []},
+        {
+            "name": "a",
+            "child": {
+                "name": "b",
+                "child": {"name": "c", "child": None, "children": []},
+                "children": [],
+            },
+            "children": [{"name": "d", "child": None, "children": []}],
+        },
+    ],
+)
+def test_recursive_dataclass_roundtrip(converter, appstruct):
+    schema = converter.convert(Node)()
+    assert schema.deserialize(schema.serialize(appstruct)) == appstruct
+
+
+@pytest.mark.parametrize(
+    "converter", [dc2colander, dc2colanderjson, dc2colanderESjson, dc2colanderavro]
+)
+def test_recursive_dataclass_bind_clone(converter):
+    appstruct = {
+        "name": "a",
+        "child": {
+            "name": "b",
+            "child": {"name": "c", "child": None, "children": []},
+            "children": [],
+        },
+        "children": [],
+    }
+    schema = converter.convert(Node)()
+    for node in [schema.bind(request=None), schema.clone()]:
+        assert node.deserialize(node.serialize(appstruct)) == appstruct
+
+
+@pytest.mark.parametrize(
+    "converter", [dc2colander, dc2colanderjson, dc2colanderESjson, dc2colanderavro]
+)
+def test_recursive_dataclass_form(converter):
+    appstruct = {
+        "name": "a",
+        "next": {"name": "b", "next": {"name": "c", "next": None}},
+    }
+    form = deform.Form(converter.convert(LinkedNode)().bind(request=None))
+    assert "hidden" in form.render(appstruct)
+    controls = [
+        ("name", "a"),
+        ("__start__", "next:mapping"),
+        ("name", "b"),
+        ("next", json.dumps({"name": "c", "next": None})),
+        ("__end__", "next:mapping"),
+    ]
+    assert form.validate(controls) == appstruct
+
+
+def test_recursive_dataclass_arrow():
+    pytest.importorskip("pyarrow")
+    from inverter import dc2arrow
+
+    with pytest.raises(TypeError):
+        dc2arrow.convert(Node)
+
+
+def test_recursive_dataclass_collected():
+    def convert():
+        @dataclasses.dataclass
+        class Local:
+            child: typing.Optional["Local"] = None
+
+        dataclass_fields(Local)
+        return weakref.ref(Local)
+
+    ref = convert()
+    # typing caches subscripted types such as typing.Optional[Local]
+    for cleanup in getattr(typing, "_cleanups", []):
+        cleanup()
+    gc.collect()
+    assert ref() is None
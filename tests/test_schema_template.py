@@ -0,0 +1,48 @@
+import dataclasses
+
+import colander
+import pytest
+
+from inverter import dc2colander
+
+
+def positive(schema, data, mode, db, **kw):
+    if data["value"] < 0:
+        return {"field": "value", "message": "must be positive"}
+
+
+positive.__required_binds__ = ["db"]
+
+
+@dataclasses.dataclass
+class Inner:
+    value: int
+
+    __validators__ = [positive]
+
+
+@dataclasses.dataclass
+class Outer:
+    name: str
+    inner: Inner
+
+
+@pytest.mark.parametrize(
+    "cstruct",
+    [
+        {"name": "a", "inner": {"value": "1"}},
+        {"name": "a", "inner": {"value": "-1"}},
+    ],
+)
+def test_template_bind_nested_validator(cstruct):
+    schema = dc2colander.convert(Outer)()
+    template = dc2colander.SchemaTemplate(schema)
+
+    def deserialize(node):
+        try:
+            return node.deserialize(cstruct)
+        except colander.Invalid as e:
+            return e.asdict()
+
+    expected = deserialize(schema.bind(db=1))
+    assert deserialize(template.bind(db=1)) == expected
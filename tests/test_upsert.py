@@ -0,0 +1,73 @@
+import dataclasses
+import typing
+
+import sqlalchemy
+from sqlalchemy.dialects import postgresql
+
+from inverter import dc2pgsqla
+
+
+@dataclasses.dataclass
+class Item:
+    id: typing.Optional[int] = dataclasses.field(
+        default=None, metadata={"primary_key": True, "autoincrement": True}
+    )
+    sku: typing.Optional[str] = dataclasses.field(
+        default=None, metadata={"unique": True}
+    )
+    name: typing.Optional[str] = None
+    qty: typing.Optional[int] = None
+
+
+class Result(object):
+    rowcount = 1
+
+
+class Connection(object):
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, stmt):
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        self.statements.append((str(compiled), compiled.params))
+        return Result()
+
+
+def upsert(appstructs, **kw):
+    connection = Connection()
+    table = dc2pgsqla.convert(Item, sqlalchemy.MetaData())
+    dc2pgsqla.upsert(connection, table, appstructs, **kw)
+    return connection.statements
+
+
+def test_upsert_statement_conflict_target():
+    table = dc2pgsqla.convert(Item, sqlalchemy.MetaData())
+    stmt = str(dc2pgsqla.upsert_statement(table).compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (sku) DO UPDATE" in stmt
+    assert "id = excluded.id" not in stmt
+    assert "sku = excluded.sku" not in stmt
+    assert "name = excluded.name" in stmt
+
+
+def test_upsert_conflict_target_per_row():
+    statements = upsert([{"id": 1, "name": "x"}, {"sku": "a", "name": "y"}])
+    assert len(statements) == 2
+    assert "ON CONFLICT (id) DO UPDATE SET name = excluded.name" in statements[0][0]
+    assert "ON CONFLICT (sku) DO UPDATE SET name = excluded.name" in statements[1][0]
+
+
+def test_upsert_write_order():
+    statements = upsert(
+        [
+            {"id": 1, "name": "x"},
+            {"id": 1, "name": "y", "qty": 3},
+            {"id": 1, "name": "z"},
+        ]
+    )
+    names = [v for stmt, params in statements for k, v in params.items() if "name" in k]
+    assert names == ["x", "y", "z"]
+
+
+def test_upsert_batches_rows():
+    statements = upsert([{"id": i, "name": str(i)} for i in range(1, 11)])
+    assert len(statements) == 1